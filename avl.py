@@ -4,6 +4,7 @@ __author__ = 'Alexey Ignatiev. Modified by Gabriel Tucker, Leon Li, Junchi Wang,
 __docformat__ = 'reStructuredText'
 
 from bst import BinarySearchTree
+from operator import itemgetter
 from typing import TypeVar, Generic
 from node import AVLTreeNode
 
@@ -14,8 +15,19 @@ I = TypeVar('I')
 class AVLTree(BinarySearchTree, Generic[K, I]):
     """ Self-balancing binary search tree using rebalancing by sub-tree
         rotations of Adelson-Velsky and Landis (AVL).
+
+        Insertion and deletion walk the tree with a loop and keep the path
+        they took, instead of recursing. Set iterative to False to use the
+        recursive insert_aux and delete_aux instead.
+
+        Every node knows the size of its sub-tree, so the tree is also an
+        order-statistic tree: kth_smallest, kth_largest, rank and
+        count_range each walk one path from the root.
     """
 
+    iterative = True
+    update_whole_path = False
+
     def __init__(self) -> None:
         """
             Initialises an empty Binary Search Tree
@@ -24,6 +36,53 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         BinarySearchTree.__init__(self)
 
+    @classmethod
+    def from_sorted(cls, pairs: list) -> 'AVLTree[K, I]':
+        """
+            Builds a perfectly balanced tree from a list of (key, item) pairs
+            that is already sorted by key. No comparisons between nodes or
+            rotations are needed, every node is created once.
+            :complexity: O(n), where n is the length of pairs
+            :raises ValueError: if the keys are repeated or not in increasing order
+        """
+
+        for i in range(1, len(pairs)):
+            if pairs[i - 1][0] == pairs[i][0]:
+                raise ValueError('Inserting duplicate item')
+            if not pairs[i - 1][0] < pairs[i][0]:
+                raise ValueError('Keys must be sorted to use from_sorted')
+        tree = cls()
+        tree.root = tree.build_balanced(pairs, 0, len(pairs))
+        tree.length = len(pairs)
+        return tree
+
+    @classmethod
+    def from_items(cls, pairs: list) -> 'AVLTree[K, I]':
+        """
+            Builds a perfectly balanced tree from a list of (key, item) pairs
+            in any order, by sorting them once and calling from_sorted.
+            :complexity: O(n*log(n)), where n is the length of pairs
+            :raises ValueError: if a key is repeated
+        """
+
+        return cls.from_sorted(sorted(pairs, key=itemgetter(0)))
+
+    def build_balanced(self, pairs: list, low: int, high: int) -> AVLTreeNode:
+        """
+            Builds a perfectly balanced sub-tree out of pairs[low:high], with
+            the middle pair as its root, and returns the root.
+            :complexity: O(high - low)
+        """
+
+        if low >= high:
+            return None
+        middle = (low + high) // 2
+        current = self.create_node(pairs[middle][0], pairs[middle][1])
+        current.left = self.build_balanced(pairs, low, middle)
+        current.right = self.build_balanced(pairs, middle + 1, high)
+        self.update_node(current)
+        return current
+
     def get_height(self, current: AVLTreeNode) -> int:
         """
             Get the height of a node. Return current.height if current is 
@@ -35,6 +94,37 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             return current.height
         return 0
 
+    def get_size(self, current: AVLTreeNode) -> int:
+        """
+            Get the number of nodes in the sub-tree of a node. Return
+            current.size if current is not None. Otherwise, return 0.
+            :complexity: O(1)
+        """
+
+        if current is not None:
+            return current.size
+        return 0
+
+    def create_node(self, key: K, item: I) -> AVLTreeNode:
+        """
+            Create a new node for the tree. Subclasses that keep extra
+            information in their nodes override this.
+            :complexity: O(1)
+        """
+
+        return AVLTreeNode(key, item)
+
+    def update_node(self, current: AVLTreeNode) -> None:
+        """
+            Recompute the height and size of current from its children.
+            Subclasses that keep extra information about the sub-tree of a
+            node override this.
+            :complexity: O(1)
+        """
+
+        current.height = 1 + max(self.get_height(current.right), self.get_height(current.left))
+        current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+
     def get_balance(self, current: AVLTreeNode) -> int:
         """
             Compute the balance factor for the current sub-tree as the value
@@ -47,7 +137,63 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         return self.get_height(current.right) - self.get_height(current.left)
 
     def __setitem__(self, key: K, item: I) -> None:
-        self.root = self.insert_aux(self.root, key, item)
+        if self.iterative:
+            self.insert_iter(key, item)
+        else:
+            self.root = self.insert_aux(self.root, key, item)
+
+    def rebalance_path(self, path: list, current: AVLTreeNode) -> None:
+        """
+            Walks back up a path of (node, went_right) pairs from the bottom,
+            hanging the new sub-tree current under each node, then updating
+            and rebalancing that node in turn, exactly as the recursive
+            insert_aux and delete_aux do when they return.
+
+            Once a node keeps its height and is not rotated, nothing above it
+            can change, so the walk stops there, unless update_whole_path is
+            set because update_node keeps other sub-tree information. The
+            callers change the size of every node on the path beforehand, as
+            sizes change all the way up to the root.
+
+            Complexity: O(len(path))
+        """
+        for i in range(len(path) - 1, -1, -1):
+            parent, went_right = path[i]
+            if went_right:
+                parent.right = current
+            else:
+                parent.left = current
+            height = parent.height
+            self.update_node(parent)
+            current = self.rebalance(parent)
+            if current is parent and parent.height == height and not self.update_whole_path:
+                return
+        self.root = current
+
+    def insert_iter(self, key: K, item: I) -> None:
+        """
+            Inserts an item into the tree in the same way as insert_aux,
+            but finds the place for it with a loop, keeping the path taken
+            to rebalance on the way back up.
+
+            Complexity: Worst case O(log(n)), best case O(1)
+        """
+        path = []
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                path.append((current, False))
+                current = current.left
+            elif key > current.key:
+                path.append((current, True))
+                current = current.right
+            else:  # key == current.key
+                raise ValueError('Inserting duplicate item')
+
+        for parent, _ in path:
+            parent.size += 1  # Every node above the new one has one more node in its sub-tree
+        self.length += 1
+        self.rebalance_path(path, self.create_node(key, item))
 
     def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
         """
@@ -59,20 +205,55 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         """
         if current is None:  # base case: at the leaf
-            current = AVLTreeNode(key, item)
+            current = self.create_node(key, item)
             self.length += 1
         elif key < current.key:
             current.left = self.insert_aux(current.left, key, item)
         elif key > current.key:
             current.right = self.insert_aux(current.right, key, item)
-            current.right_nodes += 1
         else:  # key == current.key
             raise ValueError('Inserting duplicate item')
-        current.height = 1 + max(self.get_height(current.right), self.get_height(current.left))
+        self.update_node(current)
         return self.rebalance(current)
 
     def __delitem__(self, key: K) -> None:
-        self.root = self.delete_aux(self.root, key)
+        if self.iterative:
+            self.delete_iter(key)
+        else:
+            self.root = self.delete_aux(self.root, key)
+
+    def delete_iter(self, key: K) -> None:
+        """
+            Deletes an item from the tree in the same way as delete_aux,
+            but finds the node with a loop, keeping the path taken to
+            rebalance on the way back up.
+
+            Complexity: Worst case O(log(n)), best case O(1)
+        """
+        path = []
+        current = self.root
+        while current is not None and key != current.key:
+            went_right = key > current.key
+            path.append((current, went_right))
+            current = current.right if went_right else current.left
+        if current is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+
+        if current.left is not None and current.right is not None:
+            # general case => copy the successor here, then remove the successor, which has no left child
+            path.append((current, True))
+            succ = current.right
+            while succ.left is not None:
+                path.append((succ, False))
+                succ = succ.left
+            current.key = succ.key
+            current.item = succ.item
+            current = succ
+
+        for parent, _ in path:
+            parent.size -= 1  # Every node above the removed one has one less node in its sub-tree
+        self.length -= 1
+        self.rebalance_path(path, current.left if current.left is not None else current.right)
 
     def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
         """
@@ -104,7 +285,7 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             current.key = succ.key
             current.item = succ.item
             current.right = self.delete_aux(current.right, succ.key)
-        current.height = 1 + max(self.get_height(current.right), self.get_height(current.left))
+        self.update_node(current)
         return self.rebalance(current)
 
     def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
@@ -129,10 +310,8 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         child.left = current
         current.right = center
 
-        current.height = 1 + max(self.get_height(current.right), self.get_height(current.left))
-        child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
-
-        current.right_nodes -= 1
+        self.update_node(current)
+        self.update_node(child)
 
         return child
 
@@ -159,10 +338,9 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         child.right = current
         current.left = center
 
-        current.height = 1 + max(self.get_height(current.right), self.get_height(current.left))
-        child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
+        self.update_node(current)
+        self.update_node(child)
 
-        child.right_nodes += 1
         return child
 
     def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
@@ -197,41 +375,84 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         :param k: The key we are looking for is the k'th largest
         :param current: The root node of the subtree
         :return: Returns the kth largest node in subtree of initial input
+        :raises IndexError: when k is not between 1 and the size of the subtree
 
         Complexity: Worst O(log(n)), best O(1) where n is the amount of nodes on AVLTree
         """
-        if k == root.right_nodes:
+        if root is None or not 1 <= k <= root.size:
+            raise IndexError('Out of bounds')
+        right_size = self.get_size(root.right)
+        if k <= right_size:
+            return self.kth_largest_aux(k, root.right)
+        if k == right_size + 1:
             return root
-        if k < root.right_nodes:
-            if root.right:
-                return self.kth_largest_aux(k, root.right)
-            elif root.left:
-                return self.kth_largest_aux(k, root.left)
-            else:
-                return root
-        else:
-            if root.left:
-                return self.kth_largest_aux(k - root.right_nodes, root.left)
-            else:
-                return root
+        return self.kth_largest_aux(k - right_size - 1, root.left)
 
-    def kth_largest(self, k):
+    def kth_largest(self, k: int) -> AVLTreeNode:
         """
-        Function which calls auxillary function, which returns the node of the k'th largest key in tree.
+        Function which returns the node of the k'th largest key in tree.
         :param k: The key we are looking for is the k'th largest
         :return: The node of the k'th largest key.
+        :raises IndexError: when k is not between 1 and the number of nodes
 
         Complexity: Worst O(log(n)), best O(1) where n is the amount of nodes on AVLTree
 
         Complexity analysis:
-            Why it is the complexity it is: It is O(log(n)) as it uses recursion to find the k'th element.
-            To do this we have added an attribute to every AVLTreeNode, being right_nodes. right_nodes
-            gives us the amount of nodes that are in the subtree to the right of the given node.
-            This way we can exploit the balanced aspect of an AVL tree, and find the kth element through
-            dividing and conquering the tree. We compare the amount of nodes on either side of a node,
-            to determine which path to take.
+            Why it is the complexity it is: It is O(log(n)) as it walks down one path to find the k'th element.
+            To do this every AVLTreeNode has a size, being the amount of nodes in its subtree, including
+            itself. Comparing k with the size of the right subtree of a node tells us whether the k'th largest
+            key is to the right of the node, is the node, or is to the left of it, and the AVL tree is balanced,
+            so the path is O(log(n)) long.
+        """
+        if not 1 <= k <= len(self):
+            raise IndexError('Out of bounds')
+        return self.kth_smallest(len(self) + 1 - k)
+
+    def kth_smallest(self, k: int) -> AVLTreeNode:
+        """
+        Function which returns the node of the k'th smallest key in tree.
+        :param k: The key we are looking for is the k'th smallest
+        :return: The node of the k'th smallest key.
+        :raises IndexError: when k is not between 1 and the number of nodes
+
+        Complexity: Worst O(log(n)), best O(1) where n is the amount of nodes on AVLTree
+        """
+        if not 1 <= k <= len(self):
+            raise IndexError('Out of bounds')
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if k <= left_size:
+                current = current.left
+            elif k == left_size + 1:
+                return current
+            else:
+                k -= left_size + 1
+                current = current.right
+
+    def rank(self, key: K) -> int:
+        """
+        Function which returns the number of keys in tree that are smaller than key. key does not have to be in
+        the tree, and when it is, the node of key is the (rank(key) + 1)'th smallest.
+
+        Complexity: Worst O(log(n)), best O(1) where n is the amount of nodes on AVLTree
         """
+        smaller = 0
         current = self.root
-        return self.kth_largest_aux(k, current)
+        while current is not None:
+            if key > current.key:
+                smaller += self.get_size(current.left) + 1  # current and everything to the left of it is smaller
+                current = current.right
+            else:
+                current = current.left
+        return smaller
 
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+        Function which returns the number of keys in tree that are at least lo and smaller than hi.
 
+        Complexity: O(log(n)) where n is the amount of nodes on AVLTree
+        """
+        if not lo < hi:
+            return 0
+        return self.rank(hi) - self.rank(lo)
@@ -0,0 +1,583 @@
+"""
+Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
+
+This file times the hot paths of the potion seller game against the implementations they replaced, so speedups
+can be checked on your own machine.
+
+Run all of the benchmarks with: python benchmark.py
+Or only some of them with:      python benchmark.py ranking
+"""
+
+from __future__ import annotations
+# ^ In case you aren't on Python 3.10
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from operator import itemgetter
+from random import Random
+
+from avl import AVLTree
+from game import Game
+from hash_table import LinearProbePotionTable
+from linked_stack import LinkedStack, Node
+from node import AVLTreeNode, ListNode, ProfitTreeNode, TreeNode
+from potion import Potion
+from potion_catalog import PotionCatalog
+from primes import PrimeTable, largest_prime
+from random_gen import RandomGen, check_nums, lcg
+from solver import NUMPY_AVAILABLE, NumpyProfitSolver
+
+
+def timed(function, *args) -> tuple:
+    """
+    Calls function(*args) once and returns (seconds taken, result).
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def report(name: str, size: int, seconds: float, baseline: float = None) -> None:
+    """
+    Prints one line of benchmark results, with the speedup over the baseline if one is given.
+    """
+    line = "{0:<40} n={1:<9} {2:>10.4f}s".format(name, size, seconds)
+    if baseline is not None and seconds > 0:
+        line += "  x{0:.1f}".format(baseline / seconds)
+    print(line)
+
+
+def make_valuations(size: int, seed: int = 0) -> list:
+    """
+    Returns size random [amount_purchasable, profit_factor, key] records, about a third of them unprofitable.
+    """
+    rand = Random(seed)
+    records = []
+    for i in range(size):
+        records.append([rand.randint(1, 1000), rand.uniform(0.5, 3.0), "Potion " + str(i)])
+    return records
+
+
+def rank_with_avl(records: list) -> list:
+    """
+    The ranking solve_game used to do: insert into an AVLTree, then call kth_largest once per potion.
+    """
+    profit_tree = AVLTree()
+    for record in records:
+        if record[1] > 1:
+            profit_tree[record[1], record[2]] = record
+    return [profit_tree.kth_largest(i + 1).item for i in range(len(profit_tree))]
+
+
+def rank_with_sort(records: list) -> list:
+    """
+    The ranking solve_game does now: keep the profitable records and sort them once.
+    """
+    ranked = [record for record in records if record[1] > 1]
+    ranked.sort(key=itemgetter(1, 2), reverse=True)
+    return ranked
+
+
+def benchmark_ranking(sizes: tuple = (10 ** 5, 10 ** 6)) -> None:
+    """
+    Compares the AVL round-trip ranking against the single sort.
+    """
+    for size in sizes:
+        records = make_valuations(size)
+        avl_time, _ = timed(rank_with_avl, records)
+        sort_time, _ = timed(rank_with_sort, records)
+        report("ranking: AVLTree + kth_largest", size, avl_time)
+        report("ranking: single sort", size, sort_time, avl_time)
+
+
+def avl_operations(tree: AVLTree, keys: list) -> list:
+    """
+    Times inserting, looking up, kth_largest on and deleting every key, and returns the seconds for each. Uses the
+        recursive versions of each operation when tree.iterative is False.
+    """
+    if tree.iterative:
+        lookup = tree.get_tree_node_by_key
+        kth_largest = tree.kth_largest
+    else:
+        lookup = lambda key: tree.get_tree_node_by_key_aux(tree.root, key)
+        kth_largest = lambda k: tree.kth_largest_aux(k, tree.root)
+
+    seconds = []
+    gc.collect()
+    start = time.perf_counter()
+    for key in keys:
+        tree[key] = key
+    seconds.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    seconds.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for k in range(1, len(keys) + 1):
+        kth_largest(k)
+    seconds.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        del tree[key]
+    seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def benchmark_avl(sizes: tuple = (10 ** 4, 10 ** 5, 10 ** 6)) -> None:
+    """
+    Compares the recursive and iterative AVL paths, in operations per second.
+    """
+    operations = ("insert", "lookup", "kth_largest", "delete")
+    for size in sizes:
+        keys = list(range(size))
+        Random(size).shuffle(keys)
+        recursive = AVLTree()
+        recursive.iterative = False
+        recursive_seconds = avl_operations(recursive, keys)
+        iterative_seconds = avl_operations(AVLTree(), keys)
+        for name, before, after in zip(operations, recursive_seconds, iterative_seconds):
+            print("avl {0:<12} n={1:<9} recursive {2:>12,.0f} ops/s   iterative {3:>12,.0f} ops/s  x{4:.2f}".format(
+                name, size, size / before, size / after, before / after))
+
+
+def list_largest_prime(k: int) -> int:
+    """
+    largest_prime as it used to be, sieving a list of every number below k on every call.
+    """
+    prime = [i for i in range(0, k)]
+    p = 2
+    while p * p <= k - 1:
+        if prime[p]:
+            for i in range(p ** 2, k, p):
+                prime[i] = False
+        p += 1
+    return list(filter(None, prime))[-1]
+
+
+def trial_next_prime(k: int) -> int:
+    """
+    next_prime as it used to be, checking each number from k upwards by trial division.
+    """
+    candidate = max(k, 2)
+    while True:
+        d = 2
+        while d * d <= candidate and candidate % d != 0:
+            d += 1
+        if d * d > candidate:
+            return candidate
+        candidate += 1
+
+
+def sieving_good_hash(potion_name: str, tablesize: int) -> int:
+    """
+    Potion.good_hash as it used to be, running two sieves on every call.
+    """
+    value = 0
+    a = list_largest_prime(10000)
+    b = list_largest_prime(8000)
+    for i in range(len(potion_name)):
+        value = (ord(potion_name[i]) + a * value) % tablesize
+        a = (a * b) % (tablesize - 1)
+    return value
+
+
+class SievingPotionTable(LinearProbePotionTable):
+    """
+    A potion table that hashes with sieving_good_hash.
+    """
+
+    def hash(self, potion_name: str) -> int:
+        return sieving_good_hash(potion_name, self.table_size)
+
+
+def table_lookups(table: LinearProbePotionTable, names: list) -> None:
+    """
+    Looks up every name in table.
+    """
+    for name in names:
+        table[name]
+
+
+def benchmark_hash(sizes: tuple = (1000, 10 ** 4)) -> None:
+    """
+    Compares hash table lookups per second with good_hash sieving on every call and with cached constants.
+    """
+    for size in sizes:
+        names = ["Potion " + str(i) for i in range(size)]
+        fast = LinearProbePotionTable(size)
+        for name in names:
+            fast[name] = name
+        slow = SievingPotionTable(size)
+        slow.table = fast.table  # Same slots, the hash values are identical
+        assert [sieving_good_hash(name, size * 2) for name in names] == Potion.hash_many(names, size * 2)
+
+        slow_time, _ = timed(table_lookups, slow, names)
+        fast_time, _ = timed(table_lookups, fast, names)
+        hash_many_time, _ = timed(Potion.hash_many, names, size * 2)
+        print("hash lookups: sieving every call       n={0:<9} {1:>14,.0f} lookups/s".format(size, size / slow_time))
+        print("hash lookups: cached constants         n={0:<9} {1:>14,.0f} lookups/s  x{2:.0f}".format(
+            size, size / fast_time, slow_time / fast_time))
+        print("hash_many                              n={0:<9} {1:>14,.0f} hashes/s".format(size, size / hash_many_time))
+
+
+def table_contains(table: LinearProbePotionTable, names: list) -> None:
+    """
+    Checks whether every name is in table.
+    """
+    for name in names:
+        name in table
+
+
+def benchmark_robin_hood(load_factors: tuple = (0.5, 0.75, 0.9), size: int = 20011) -> None:
+    """
+    Compares plain linear probing with Robin Hood insertion on successful and unsuccessful lookups, in fixed size
+        tables filled to each load factor.
+    """
+    for load_factor in load_factors:
+        count = int(size * load_factor)
+        names = ["Potion " + str(i) for i in range(count)]
+        missing = ["Missing " + str(i) for i in range(count)]
+        for robin_hood in (False, True):
+            table = LinearProbePotionTable(count, True, size, None, robin_hood)
+            for name in names:
+                table[name] = name
+            for label, keys in (("hit", names), ("miss", missing)):
+                probes_before = table.probe_total
+                seconds, _ = timed(table_contains, table, keys)
+                print("{0:<12} load={1:<5} {2:<5} {3:>12,.0f} lookups/s  {4:>7.2f} probes/lookup  max {5}".format(
+                    "robin hood" if robin_hood else "linear", load_factor, label, count / seconds,
+                    (table.probe_total - probes_before) / count, len(table.probe_distribution()) - 1))
+
+
+def filled_table(names: list, values: list, compact: bool) -> LinearProbePotionTable:
+    """
+    Returns a table holding every name, with the matching value.
+    """
+    table = LinearProbePotionTable(len(names), True, -1, 0.75, False, compact)
+    for name, value in zip(names, values):
+        table[name] = value
+    return table
+
+
+def benchmark_compact(sizes: tuple = (10 ** 4, 10 ** 5)) -> None:
+    """
+    Compares the memory held by a table, and lookups and updates per second, with a (key, data) tuple per item and
+        with the compact parallel arrays. The names and data are made beforehand, so only the table is measured.
+    """
+    for size in sizes:
+        names = ["Potion " + str(i) for i in range(size)]
+        values = [Potion("Type", name, 1.0, 1) for name in names]
+        results = []
+        for compact in (False, True):
+            gc.collect()
+            tracemalloc.start()
+            table = filled_table(names, values, compact)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            gc.collect()
+            lookup_seconds, _ = timed(table_lookups, table, names)
+            start = time.perf_counter()
+            for name, value in zip(names, values):
+                table[name] = value
+            update_seconds = time.perf_counter() - start
+            results.append((memory, lookup_seconds, update_seconds))
+            print("{0:<8} n={1:<9} {2:>7.1f} bytes/item  {3:>12,.0f} lookups/s  {4:>12,.0f} updates/s".format(
+                "compact" if compact else "tuples", size, memory / size, size / lookup_seconds,
+                size / update_seconds))
+            del table
+        (tuple_memory, tuple_lookup, tuple_update), (memory, lookup, update) = results
+        print("compact  n={0:<9} memory x{1:.2f}   lookups x{2:.2f}   updates x{3:.2f}".format(
+            size, memory / tuple_memory, tuple_lookup / lookup, tuple_update / update))
+
+
+def benchmark_snapshot(sizes: tuple = (10 ** 5, 10 ** 6), lookups: int = 1000) -> None:
+    """
+    Compares starting a game with set_total_potion_data against loading a saved snapshot of the same catalog, each
+        followed by a few lookups, as a new worker process would do.
+    """
+    for size in sizes:
+        potion_data = [("Potion " + str(i), "Type " + str(i % 7), 1.0 + i % 1000) for i in range(size)]
+        names = [name for name, _, _ in potion_data[::size // lookups]]
+        path = os.path.join(tempfile.mkdtemp(), "catalog.snap")
+        game = Game()
+        build_seconds, _ = timed(game.set_total_potion_data, potion_data)
+        save_seconds, _ = timed(game.save_potion_data, path)
+        for verify in (True, False):
+            loaded = Game()
+            load_seconds, _ = timed(loaded.load_potion_data, path, verify)
+            lookup_seconds, _ = timed(loaded.catalog.ids_of, names)
+            report("snapshot load{0} + {1} lookups".format(" (checksum)" if verify else "", len(names)), size,
+                   load_seconds + lookup_seconds, build_seconds)
+            loaded.catalog.close()
+        report("set_total_potion_data", size, build_seconds)
+        report("save_potion_data", size, save_seconds)
+        print("snapshot file                            n={0:<9} {1:>10.1f} bytes/potion".format(
+            size, os.path.getsize(path) / size))
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+
+def bytes_per_object(make, size: int) -> float:
+    """
+    Returns the memory held by size objects made by calling make(), per object, not counting the list holding them.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = [None] * size
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(size):
+        objects[i] = make()
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return memory / size
+
+
+def benchmark_memory(size: int = 10 ** 5) -> None:
+    """
+    Compares the bytes per potion and per node of the slotted classes against the same classes with a __dict__, as
+        they were before, and the bytes per node of a whole AVL tree of potions.
+    """
+    item = [1.0, 2.0, "Potion"]
+    classes = (
+        (Potion, lambda cls: cls("Type", "Potion", 1.0, 1)),
+        (TreeNode, lambda cls: cls(0, item)),
+        (AVLTreeNode, lambda cls: cls(0, item)),
+        (ProfitTreeNode, lambda cls: cls(0, item)),
+        (ListNode, lambda cls: cls(item)),
+        (Node, lambda cls: cls(item)),
+    )
+    for cls, make in classes:
+        with_dict = type(cls.__name__, (cls,), {})  # A subclass without __slots__ gets a __dict__ back
+        before = bytes_per_object(lambda: make(with_dict), size)
+        after = bytes_per_object(lambda: make(cls), size)
+        print("{0:<16} {1:>7.1f} bytes with __dict__  {2:>7.1f} bytes with __slots__  x{3:.2f}".format(
+            cls.__name__, before, after, after / before))
+
+    potions = [Potion("Type", "Potion " + str(i), float(i), 1) for i in range(size)]
+    gc.collect()
+    tracemalloc.start()
+    tree = AVLTree.from_items([(potion.buy_price, potion) for potion in potions])
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("AVLTree          n={0:<9} {1:>7.1f} bytes/node".format(
+        len(tree), memory / size))
+
+
+def potion_table(potion_data: list) -> LinearProbePotionTable:
+    """
+    Returns a table of one Potion per (name, potion_type, buy_price) in potion_data, as the catalog used to be kept.
+    """
+    table = LinearProbePotionTable(len(potion_data))
+    table.set_many([(name, Potion.create_empty(potion_type, name, buy_price))
+                    for name, potion_type, buy_price in potion_data])
+    return table
+
+
+def gather_from_potions(table: LinearProbePotionTable, names: list) -> tuple:
+    """
+    Reads the price and quantity of every name from the Potion objects in table.
+    """
+    potions = table.get_many(names)
+    return [potion.buy_price for potion in potions], [potion.quantity for potion in potions]
+
+
+def gather_from_columns(catalog: PotionCatalog, names: list) -> tuple:
+    """
+    Reads the price and quantity of every name from the columns of catalog.
+    """
+    potion_ids = catalog.ids_of(names)
+    buy_prices, quantities = catalog.buy_prices, catalog.quantities
+    return [buy_prices[i] for i in potion_ids], [quantities[i] for i in potion_ids]
+
+
+def benchmark_catalog(sizes: tuple = (10 ** 4, 10 ** 5)) -> None:
+    """
+    Compares the memory held by the potion catalog, and the time to read the price and quantity of every potion,
+        with a Potion per potion in a hash table and with the columnar PotionCatalog.
+    """
+    for size in sizes:
+        potion_data = [("Potion " + str(i), "Type " + str(i % 7), 1.0 + i % 1000) for i in range(size)]
+        names = [name for name, _, _ in potion_data]
+        memory = []
+        for build in (potion_table, PotionCatalog.from_potion_data):
+            gc.collect()
+            tracemalloc.start()
+            built = build(potion_data)
+            memory.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+            del built
+        print("catalog memory  n={0:<9} {1:>7.1f} bytes/potion with Potions  {2:>7.1f} with columns  x{3:.2f}".format(
+            size, memory[0] / size, memory[1] / size, memory[1] / memory[0]))
+
+        table = potion_table(potion_data)
+        catalog = PotionCatalog.from_potion_data(potion_data)
+        objects_seconds, _ = timed(gather_from_potions, table, names)
+        columns_seconds, _ = timed(gather_from_columns, catalog, names)
+        report("gather prices from Potions", size, objects_seconds)
+        report("gather prices from columns", size, columns_seconds, objects_seconds)
+        if NUMPY_AVAILABLE:
+            numpy_seconds, _ = timed(NumpyProfitSolver.from_columns, catalog.buy_prices, catalog.quantities,
+                                     catalog.ids_of(names), [2.0] * size, names)
+            report("NumpyProfitSolver.from_columns (ranked)", size, numpy_seconds)
+
+
+def string_randints(seed: int, k: int, n: int) -> list:
+    """
+    RandomGen.randint as it used to be, called n times: each number is built bit by bit from binary strings.
+    """
+    numbers = lcg(pow(2, 32), 134775813, 1, seed)
+    result = []
+    for _ in range(n):
+        five_ran_nums = ["{:032b}".format(next(numbers))[:16] for _ in range(5)]
+        output_binary = ""
+        for i in range(16):
+            output_binary += "1" if check_nums(five_ran_nums, i) else "0"
+        result.append(int(output_binary, 2) % k + 1)
+    return result
+
+
+def benchmark_random(sizes: tuple = (10 ** 4, 10 ** 6)) -> None:
+    """
+    Compares random numbers per second from the old string based randint, the bitwise randint and randints, with and
+        without NumPy, and times jumping ahead and splitting into streams.
+    """
+    for size in sizes:
+        old_seconds, expected = timed(string_randints, 0, 1000, size)
+        generator = RandomGen()
+        new_seconds, numbers = timed(lambda: [generator.randint(1000) for _ in range(size)])
+        assert numbers == expected
+        report("randint with strings", size, old_seconds)
+        report("randint with bitwise majority", size, new_seconds, old_seconds)
+        generator = RandomGen()
+        generator.numpy_threshold = size + 1
+        batch_seconds, numbers = timed(generator.randints, 1000, size)
+        assert numbers == expected
+        report("randints", size, batch_seconds, old_seconds)
+        if NUMPY_AVAILABLE:
+            generator = RandomGen()
+            numpy_seconds, numbers = timed(generator.randints, 1000, size)
+            assert numbers == expected
+            report("randints with NumPy", size, numpy_seconds, old_seconds)
+
+    generator = RandomGen()
+    advance_seconds, _ = timed(generator.advance, 10 ** 12)
+    report("advance past 10^12 numbers", 10 ** 12, advance_seconds)
+    split_seconds, _ = timed(generator.split, 1000)
+    report("split into 1000 streams", 1000, split_seconds)
+
+
+def table_capacities(find_prime, limit: int) -> list:
+    """
+    The prime capacities a hash table goes through when it grows by doubling from 1 up to limit slots.
+    """
+    capacities = [find_prime(1)]
+    while capacities[-1] < limit:
+        capacities.append(find_prime(capacities[-1] * 2))
+    return capacities
+
+
+def benchmark_primes(sizes: tuple = (10 ** 6, 10 ** 7), calls: int = 100) -> None:
+    """
+    Compares the old list sieve with the cached prime table for repeated largest_prime calls, and trial division with
+        the table for the capacities of a hash table growing into the millions, then times the segmented sieve.
+    """
+    old_seconds, expected = timed(lambda: [list_largest_prime(99991) for _ in range(calls)])
+    new_seconds, primes = timed(lambda: [largest_prime(99991) for _ in range(calls)])
+    assert primes == expected
+    report("largest_prime(99991) with a list sieve", calls, old_seconds)
+    report("largest_prime(99991) with the prime table", calls, new_seconds, old_seconds)
+    for size in sizes:
+        old_seconds, expected = timed(table_capacities, trial_next_prime, size)
+        new_seconds, capacities = timed(table_capacities, PrimeTable().next_prime, size)
+        assert capacities == expected
+        report("growth capacities with trial division", size, old_seconds)
+        report("growth capacities with a prime table", size, new_seconds, old_seconds)
+        table = PrimeTable()
+        sieve_seconds, _ = timed(table.extend, size * 10)
+        report("extend the prime table (primes found: {0})".format(len(table.primes)), size * 10, sieve_seconds)
+
+
+class LinkedStackInOrderIterator:
+    """
+    BSTInOrderIterator as it used to be, pushing a new linked stack node for every tree node it visits.
+    """
+
+    def __init__(self, root: TreeNode) -> None:
+        self.stack = LinkedStack()
+        self.current = root
+
+    def __iter__(self) -> LinkedStackInOrderIterator:
+        return self
+
+    def __next__(self):
+        while self.current:
+            self.stack.push(self.current)
+            self.current = self.current.left
+        if self.stack.is_empty():
+            raise StopIteration
+        result = self.stack.pop()
+        self.current = result.right
+        return result.key
+
+
+def iteration_peak(iterator) -> int:
+    """
+    Runs iterator to the end and returns the peak memory allocated while doing so, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    for _ in iterator:
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_iterate(sizes: tuple = (10 ** 6,)) -> None:
+    """
+    Compares the time and peak memory of iterating over a whole AVL tree with the old linked stack iterator, the list
+        stack iterator yielding keys and yielding (key, item) pairs, and items over a range that covers the tree.
+    """
+    for size in sizes:
+        tree = AVLTree.from_sorted([(i, str(i)) for i in range(size)])
+        iterators = (
+            ("linked stack, keys", lambda: LinkedStackInOrderIterator(tree.root)),
+            ("list stack, keys", lambda: iter(tree)),
+            ("list stack, items", lambda: tree.items()),
+            ("list stack, items(lo, hi)", lambda: tree.items(-1, size)),
+        )
+        baseline = None
+        for name, make in iterators:
+            seconds, count = timed(lambda: sum(1 for _ in make()))
+            assert count == size
+            peak = iteration_peak(make())
+            report(name, size, seconds, baseline)
+            print("{0:<40} peak {1:>10,} bytes".format("", peak))
+            if baseline is None:
+                baseline = seconds
+
+
+BENCHMARKS = {
+    "ranking": benchmark_ranking,
+    "avl": benchmark_avl,
+    "hash": benchmark_hash,
+    "robin_hood": benchmark_robin_hood,
+    "compact": benchmark_compact,
+    "snapshot": benchmark_snapshot,
+    "memory": benchmark_memory,
+    "catalog": benchmark_catalog,
+    "random": benchmark_random,
+    "primes": benchmark_primes,
+    "iterate": benchmark_iterate,
+}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
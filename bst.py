@@ -9,7 +9,6 @@ __author__ = 'Brendon Taylor, modified by Alexey Ignatiev and Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
 from typing import TypeVar, Generic
-from linked_stack import LinkedStack
 from node import TreeNode
 import sys
 
@@ -22,14 +21,17 @@ T = TypeVar('T')
 
 class BSTInOrderIterator:
     """ In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, with a Python list as the stack,
+        so nothing is allocated per node visited. Yields keys, or (key, item)
+        pairs when items is set.
     """
 
-    def __init__(self, root: TreeNode[K, I]) -> None:
+    def __init__(self, root: TreeNode[K, I], items: bool = False) -> None:
         """ Iterator initialiser. """
 
-        self.stack = LinkedStack()
+        self.stack = []
         self.current = root
+        self.items = items
 
     def __iter__(self) -> BSTInOrderIterator:
         """ Standard __iter__() method for initialisers. Returns itself. """
@@ -39,21 +41,100 @@ class BSTInOrderIterator:
     def __next__(self) -> K:
         """ The main body of the iterator.
             Returns keys of the BST one by one respecting the in-order.
+            :complexity: amortised O(1), worst case O(D), where D is the depth of the tree
         """
 
-        while self.current:
-            self.stack.push(self.current)
-            self.current = self.current.left
+        stack = self.stack
+        current = self.current
+        while current is not None:
+            stack.append(current)
+            current = current.left
 
-        if self.stack.is_empty():
+        if not stack:
             raise StopIteration
 
-        result = self.stack.pop()
+        result = stack.pop()
         self.current = result.right
 
+        if self.items:
+            return result.key, result.item
         return result.key
 
 
+class BSTRangeIterator:
+    """ In-order iterator over the keys lo <= key < hi of the binary search
+        tree, yielding (key, item) pairs, from the smallest key up or, with
+        reverse, from the largest key down. Either bound may be None.
+
+        Only the path down to the first key in range is put on the stack to
+        start with, and one node is read at a time after that, so stopping
+        early never visits the rest of the tree.
+    """
+
+    def __init__(self, root: TreeNode[K, I], lo: K = None, hi: K = None, reverse: bool = False) -> None:
+        """
+            Iterator initialiser.
+            :complexity: O(D), where D is the depth of the tree
+        """
+
+        self.stack = []
+        self.lo = lo
+        self.hi = hi
+        self.reverse = reverse
+        self.push_path(root)
+
+    def push_path(self, current: TreeNode[K, I]) -> None:
+        """
+            Pushes the nodes on the way down from current to the first key in
+            range of its sub-tree, skipping the sub-trees that are out of range.
+            :complexity: O(D), where D is the depth of the tree
+        """
+
+        stack = self.stack
+        if self.reverse:
+            hi = self.hi
+            while current is not None:
+                if hi is not None and not current.key < hi:
+                    current = current.left
+                else:
+                    stack.append(current)
+                    current = current.right
+        else:
+            lo = self.lo
+            while current is not None:
+                if lo is not None and current.key < lo:
+                    current = current.right
+                else:
+                    stack.append(current)
+                    current = current.left
+
+    def __iter__(self) -> BSTRangeIterator:
+        """ Standard __iter__() method for initialisers. Returns itself. """
+
+        return self
+
+    def __next__(self) -> tuple[K, I]:
+        """ The main body of the iterator.
+            Returns the (key, item) pairs in range one by one, in order.
+            :complexity: amortised O(1), worst case O(D)
+        """
+
+        if not self.stack:
+            raise StopIteration
+        result = self.stack.pop()
+        if self.reverse:
+            if self.lo is not None and result.key < self.lo:
+                self.stack.clear()  # Every key left is smaller still
+                raise StopIteration
+            self.push_path(result.left)
+        else:
+            if self.hi is not None and not result.key < self.hi:
+                self.stack.clear()  # Every key left is larger still
+                raise StopIteration
+            self.push_path(result.right)
+        return result.key, result.item
+
+
 class BinarySearchTree(Generic[K, I]):
     """ Basic binary search tree. """
 
@@ -94,6 +175,33 @@ class BinarySearchTree(Generic[K, I]):
         """ Create an in-order iterator. """
         return BSTInOrderIterator(self.root)
 
+    def items(self, lo: K = None, hi: K = None) -> BSTRangeIterator | BSTInOrderIterator:
+        """
+            Create an iterator over the (key, item) pairs with lo <= key < hi,
+            from the smallest key up. Leave out lo or hi for no bound.
+            :complexity: O(D) to start, where D is the depth of the tree, then
+                amortised O(1) per pair
+        """
+        if lo is None and hi is None:
+            return BSTInOrderIterator(self.root, True)  # No bounds to check
+        return BSTRangeIterator(self.root, lo, hi)
+
+    def reversed(self, lo: K = None, hi: K = None) -> BSTRangeIterator:
+        """
+            Create an iterator over the (key, item) pairs with lo <= key < hi,
+            from the largest key down. Leave out lo or hi for no bound.
+            :complexity: see items(self, lo: K, hi: K)
+        """
+        return BSTRangeIterator(self.root, lo, hi, True)
+
+    def iter_from(self, key: K) -> BSTRangeIterator:
+        """
+            Create an iterator over the (key, item) pairs from key, or the
+            next key up if key is not in the tree, to the largest key.
+            :complexity: see items(self, lo: K, hi: K)
+        """
+        return BSTRangeIterator(self.root, key)
+
     def __getitem__(self, key: K) -> I:
         """
             Attempts to get an item in the tree, it uses the Key to attempt to find it
@@ -104,7 +212,21 @@ class BinarySearchTree(Generic[K, I]):
         return self.get_tree_node_by_key(key).item
 
     def get_tree_node_by_key(self, key: K) -> TreeNode:
-        return self.get_tree_node_by_key_aux(self.root, key)
+        """
+            Finds the node with the given key, walking down the tree with a
+            loop rather than recursing like get_tree_node_by_key_aux.
+            :complexity best: O(CompK) finds the item in the root of the tree
+            :complexity worst: O(CompK * D) item is not found, where D is the depth of the tree
+        """
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
         if current is None:  # base case: empty
@@ -208,6 +330,24 @@ class BinarySearchTree(Generic[K, I]):
             current = current.left
         return current
 
+    def get_nodes_in_order(self) -> list[TreeNode]:
+        """
+            Get every node of the tree, from the smallest key to the largest.
+
+            Complexity: O(n), where n is the number of nodes
+        """
+        nodes = []
+        stack = []
+        current = self.root
+        while current is not None or stack:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            nodes.append(current)
+            current = current.right
+        return nodes
+
     def is_leaf(self, current: TreeNode) -> bool:
         """ Simple check whether or not the node is a leaf. """
 
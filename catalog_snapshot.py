@@ -0,0 +1,287 @@
+"""
+Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
+
+This file saves the potion catalog (Game.catalog) to a binary snapshot file, and reads it back through mmap, so a
+new process can answer lookups straight away instead of hashing every name again. Every process that maps the same
+snapshot shares its pages, until it changes a quantity.
+
+The file is a header followed by a body:
+
+    header: magic, format version, good_hash flag, the two good_hash constants, table size, number of potions,
+        number of potion types, body length and a CRC-32 checksum of the body, packed as HEADER
+    body: the columns of the catalog, each indexed by potion id: buy prices and quantities as doubles, then the slot
+        layout as one int per slot giving the id of the potion in it or EMPTY_SLOT, then the type ids as ints, then
+        the offsets of every name and of every potion type in the string area, then the string area of UTF-8 names
+        followed by potion types
+
+A snapshot is rejected with a ValueError when the magic, version or hash constants do not match this code, as the
+    slot layout would be wrong, or when the checksum does not match the body.
+"""
+
+from __future__ import annotations
+# ^ In case you aren't on Python 3.10
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from potion import GOOD_HASH_BASE, GOOD_HASH_MULTIPLIER, Potion
+
+MAGIC = b"POTNSNAP"
+VERSION = 2
+HEADER = struct.Struct("<8sIIIIIIIQI")
+EMPTY_SLOT = -1
+
+
+def save_catalog_snapshot(catalog, path: str) -> None:
+    """
+    This function writes every potion in catalog, a PotionCatalog or CatalogSnapshot, to a snapshot file at path.
+        Potion ids are kept, and the slot layout is laid out again from the hash of every name, so no tombstones
+        are saved. The file is written next to path and then moved over it, so a process mapping path never sees
+        half of a snapshot.
+
+    Complexity: O(N + S) with a good hash function, where N is the total length of the names and types and S is the
+        table size
+    """
+    count = len(catalog)
+    table_size = catalog.table_size
+    names = [catalog.name_of(potion_id) for potion_id in range(count)]
+    if count > table_size:
+        raise ValueError("Cannot fit {0} potions into {1} slots.".format(count, table_size))
+    if catalog.good_hash:
+        homes = Potion.hash_many(names, table_size)
+    else:
+        homes = [Potion.bad_hash(name, table_size) for name in names]
+
+    slots = array('i', [EMPTY_SLOT]) * table_size
+    for potion_id, home in enumerate(homes):
+        position = home
+        while slots[position] != EMPTY_SLOT:  # Names are all different, so just find an empty slot
+            position = (position + 1) % table_size
+        slots[position] = potion_id
+
+    strings = bytearray()
+    name_offsets = array('I', [0])
+    for name in names:
+        strings += name.encode("utf-8")
+        name_offsets.append(len(strings))
+    type_offsets = array('I', [len(strings)])
+    for potion_type in catalog.potion_types:
+        strings += potion_type.encode("utf-8")
+        type_offsets.append(len(strings))
+
+    columns = [array('d', catalog.buy_prices), array('d', catalog.quantities), slots, array('i', catalog.type_ids),
+               name_offsets, type_offsets]
+    if sys.byteorder == "big":  # The file is always little endian
+        for column in columns:
+            column.byteswap()
+    body = b"".join(column.tobytes() for column in columns) + strings
+
+    header = HEADER.pack(MAGIC, VERSION, int(bool(catalog.good_hash)), GOOD_HASH_BASE, GOOD_HASH_MULTIPLIER,
+                         table_size, count, len(catalog.potion_types), len(body), zlib.crc32(body))
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(header)
+        snapshot_file.write(body)
+    os.replace(temporary_path, path)
+
+
+class CatalogSnapshot:
+    """
+    Catalog Snapshot
+
+    A potion catalog mapped from a snapshot file, which can be used in place of a PotionCatalog. Its columns are
+        views straight into the mapped file, and lookups probe through the saved slot layout. The file is mapped
+        copy on write, so quantities can be changed while it is open without changing the file. Potions cannot be
+        added.
+
+    attributes:
+        path: the snapshot file
+        good_hash: Boolean value == True if the slot layout was made with Potion.good_hash, otherwise Potion.bad_hash
+        table_size: number of slots in the slot layout
+        count: number of potions
+        potion_types: every potion type, indexed by type id
+        buy_prices, quantities, type_ids: the columns of the catalog, indexed by potion id
+        slots, name_offsets: the slot layout, and where the name of each potion id starts and ends in the string area
+    """
+
+    def __init__(self, path: str, verify: bool = True) -> None:
+        """
+        Maps the snapshot at path. With verify the checksum of the body is checked, which reads the whole file once.
+
+        Complexity: O(T), or O(F) with verify, where T is the total length of the potion types and F is the size of
+            the file
+        :raises ValueError: when the snapshot is stale or corrupt
+        """
+        if sys.byteorder == "big":
+            raise ValueError("Catalog snapshots can only be mapped on little endian machines.")
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            self.map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.views = []
+        try:
+            self.__read(verify)
+        except ValueError:
+            self.close()
+            raise
+
+    def __read(self, verify: bool) -> None:
+        """
+        Checks the header against this code and the body, and sets up a view of each column of the body.
+        :complexity: O(T), or O(F) with verify, where T is the total length of the potion types and F is the size of
+            the file
+        :raises ValueError: when the snapshot is stale or corrupt
+        """
+        if len(self.map) < HEADER.size:
+            raise ValueError("{0} is too short to be a catalog snapshot.".format(self.path))
+        magic, version, good_hash, base, multiplier, table_size, count, type_count, body_length, checksum = \
+            HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError("{0} is not a catalog snapshot.".format(self.path))
+        if version != VERSION:
+            raise ValueError("{0} is a version {1} snapshot, expected version {2}.".format(self.path, version, VERSION))
+        if (base, multiplier) != (GOOD_HASH_BASE, GOOD_HASH_MULTIPLIER):
+            raise ValueError("{0} was saved with a different hash function.".format(self.path))
+        strings_start = HEADER.size + 16 * count + 4 * (table_size + count + count + 1 + type_count + 1)
+        if len(self.map) != HEADER.size + body_length or len(self.map) < strings_start:
+            raise ValueError("{0} has the wrong length.".format(self.path))
+        body = memoryview(self.map)[HEADER.size:]
+        self.views.append(body)
+        if verify and zlib.crc32(body) != checksum:
+            raise ValueError("{0} does not match its checksum.".format(self.path))
+
+        self.good_hash = bool(good_hash)
+        self.table_size = table_size
+        self.count = count
+        start = 0
+        columns = []
+        for code, length in (('d', count), ('d', count), ('i', table_size), ('i', count), ('I', count + 1),
+                             ('I', type_count + 1)):
+            end = start + struct.calcsize(code) * length
+            columns.append(body[start:end].cast(code))
+            start = end
+        self.views.extend(columns)
+        self.buy_prices, self.quantities, self.slots, self.type_ids, self.name_offsets, type_offsets = columns
+        self.strings = body[start:]
+        self.views.append(self.strings)
+        self.potion_types = [bytes(self.strings[type_offsets[i]:type_offsets[i + 1]]).decode("utf-8")
+                             for i in range(type_count)]
+
+    def close(self) -> None:
+        """
+        Unmaps the snapshot. Nothing can be looked up after this.
+        :complexity: O(1)
+        """
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        self.map.close()
+
+    def __enter__(self) -> CatalogSnapshot:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of potions in the snapshot
+        :complexity: O(1)
+        """
+        return self.count
+
+    def hash_many(self, potion_names: list[str]) -> list[int]:
+        """
+        This function gives the hash of every name in potion_names with the hash function the slot layout was made
+            with, in the same order, in one pass.
+
+        Time complexity (Best and worst): O(total length of potion_names)
+        """
+        if self.good_hash:
+            return Potion.hash_many(potion_names, self.table_size)
+        return [Potion.bad_hash(potion_name, self.table_size) for potion_name in potion_names]
+
+    def __find(self, key: str, home: int) -> int:
+        """
+        Find the id of this key using linear probing through the slot layout, where home is the hash of the key
+        :complexity: O(K) with a good hash function, where K is the size of the key
+        :raises KeyError: When the key is not in the snapshot
+        """
+        key_bytes = key.encode("utf-8")
+        slots = self.slots
+        name_offsets = self.name_offsets
+        position = home
+        for _ in range(self.table_size):
+            potion_id = slots[position]
+            if potion_id == EMPTY_SLOT:
+                break
+            start = name_offsets[potion_id]
+            if name_offsets[potion_id + 1] - start == len(key_bytes) and \
+                    self.strings[start:start + len(key_bytes)] == key_bytes:
+                return potion_id
+            position = (position + 1) % self.table_size
+        raise KeyError(key)
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Checks to see if the potion called name is in the snapshot
+        :complexity: O(K) with a good hash function, where K is the size of the name
+        """
+        try:
+            self.id_of(name)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def id_of(self, name: str) -> int:
+        """
+        Returns the id of the potion called name
+        :complexity: O(K) with a good hash function, where K is the size of the name
+        :raises KeyError: when the potion doesn't exist
+        """
+        return self.__find(name, self.hash_many([name])[0])
+
+    def ids_of(self, names: list[str]) -> list[int]:
+        """
+        Returns the id of the potion called each name in names, in the same order. The names are hashed together,
+            and a name that is repeated in names is only looked up once.
+        :complexity: O(K) with a good hash function, where K is the total size of the names
+        :raises KeyError: when one of the potions doesn't exist
+        """
+        unique = list(dict.fromkeys(names))
+        found = {name: self.__find(name, home) for name, home in zip(unique, self.hash_many(unique))}
+        return [found[name] for name in names]
+
+    def name_of(self, potion_id: int) -> str:
+        """
+        Returns the name of the potion with this id
+        :complexity: O(L) where L is the length of the name
+        """
+        return bytes(self.strings[self.name_offsets[potion_id]:self.name_offsets[potion_id + 1]]).decode("utf-8")
+
+    def potion(self, potion_id: int) -> Potion:
+        """
+        Returns a Potion holding the details of the potion with this id. It is a copy, so changing it does not change
+            the snapshot.
+        :complexity: O(L) where L is the length of the name
+        """
+        return Potion(self.potion_types[self.type_ids[potion_id]], self.name_of(potion_id), self.buy_prices[potion_id],
+                      self.quantities[potion_id])
+
+    def __getitem__(self, name: str) -> Potion:
+        """
+        Returns a Potion holding the details of the potion called name
+        :see: #self.potion(potion_id: int)
+        :raises KeyError: when the potion doesn't exist
+        """
+        return self.potion(self.id_of(name))
+
+    def items(self) -> list[tuple[str, Potion]]:
+        """
+        Returns the (name, potion) pair of every potion, in order of id
+        :complexity: O(N) where N is the total length of the names
+        """
+        return [(potion.name, potion) for potion in map(self.potion, range(self.count))]
@@ -0,0 +1,84 @@
+"""
+Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
+
+This file gives a Fenwick tree (binary indexed tree) of counts, which lets us sample items by rank without
+replacement, without having to delete them from the tree they came from.
+"""
+
+
+class FenwickTree:
+    """
+    Fenwick Tree
+
+    Keeps a count for each position 0 to size - 1, and can find prefix sums and the position of the k'th counted
+        item in O(log(size)).
+
+    attributes:
+        size: number of positions
+        tree: tree[i] is the sum of the counts of the positions (i - lowbit(i), i], 1-indexed
+        total: sum of all of the counts
+    """
+
+    def __init__(self, counts: list[int]) -> None:
+        """
+        Builds the tree from the starting count of every position.
+
+        Complexity: O(N), where N is length of counts
+        """
+        self.size = len(counts)
+        self.tree = [0] + list(counts)
+        for i in range(1, self.size + 1):  # Push each partial sum up to its parent once
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+        self.total = sum(counts)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of positions
+        :complexity: O(1)
+        """
+        return self.size
+
+    def add(self, index: int, amount: int) -> None:
+        """
+        Adds amount to the count at position index.
+
+        Complexity: O(log(N)), where N is the number of positions
+        """
+        self.total += amount
+        index += 1
+        while index <= self.size:
+            self.tree[index] += amount
+            index += index & -index
+
+    def prefix_sum(self, index: int) -> int:
+        """
+        Returns the sum of the counts of positions 0 to index - 1.
+
+        Complexity: O(log(N)), where N is the number of positions
+        """
+        result = 0
+        while index > 0:
+            result += self.tree[index]
+            index -= index & -index
+        return result
+
+    def select(self, k: int) -> int:
+        """
+        Returns the position of the k'th smallest counted item, where k starts at 1. With counts of 0 or 1 this is
+            the k'th position still present.
+
+        Complexity: O(log(N)), where N is the number of positions
+        :raises IndexError: when k is not between 1 and total
+        """
+        if not 1 <= k <= self.total:
+            raise IndexError("k out of range")
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step > 0:  # Walk down from the largest power of two, keeping the sum before position below k
+            if position + step <= self.size and self.tree[position + step] < k:
+                position += step
+                k -= self.tree[position]
+            step >>= 1
+        return position
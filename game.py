@@ -8,10 +8,16 @@ It has a class Game, which allows us to play the potion seller game.
 
 from __future__ import annotations
 # ^ In case you aren't on Python 3.10
+from multiprocessing import Pool, cpu_count
+from operator import itemgetter
+from typing import Iterable, Iterator
 from avl import AVLTree
+from catalog_snapshot import CatalogSnapshot, save_catalog_snapshot
+from fenwick import FenwickTree
 from hash_table import LinearProbePotionTable
-from potion import Potion
+from potion_catalog import PotionCatalog
 from random_gen import RandomGen
+from solver import NUMPY_AVAILABLE, NumpyProfitSolver, ProfitSolver, solve_in_chunks
 
 
 class Game:
@@ -20,21 +26,31 @@ class Game:
 
     rand: random number seed
 
-    potions_hash: This is a hash table where all potions available in game are stored for quick retrieval to look at
-        details
+    catalog: This is a PotionCatalog of all potions available in game, which gives each potion name an id through a
+        hash table, and keeps the type, price and litres in vendor inventory of every potion in columns indexed by
+        id. After load_potion_data it is a CatalogSnapshot, which works the same way
 
     vendor_company_tree: This is where all potions in vendor inventory all stored in a tree, based on buy price.
 
-    vendor_company_hash: This is a hash table where all potions available in vendor company inventory are stored for
-        quick retrieval to look at details
+    vendor_company_hash: This is a hash table from the name of every potion in vendor company inventory to its id in
+        catalog, for quick retrieval of its details
+
+    numpy_threshold: solve_game uses the NumPy backend when NumPy is installed and there are at least this many
+        potion valuations
+
+    solve_many_serial_threshold: solve_many runs scenarios one after another in this process when there are fewer
+        than this many of them, as starting worker processes would cost more than it saves
     """
 
+    numpy_threshold = 10000
+    solve_many_serial_threshold = 64
+
     def __init__(self, seed=0) -> None:
         """
         Initialisation
         """
         self.rand = RandomGen(seed=seed)
-        self.potions_hash = None
+        self.catalog = None
         self.vendor_company_tree = AVLTree()
         self.vendor_company_hash = None
 
@@ -45,12 +61,28 @@ class Game:
         Complexity: O(N), where N is length potion_data
         """
         # Need to set vendors potions to all in potion_data, at 0 litres
-        self.potions_hash = LinearProbePotionTable(len(potion_data), True, -1)
-        for i in range(len(potion_data)):
-            key, potion_type, price = potion_data[i][0], potion_data[i][1], potion_data[i][
-                2]  # Prepare to create empty potions
-            data = Potion.create_empty(potion_type, key, price)  # Data = (Empty class of potion)
-            self.potions_hash.insert(key, data)  # Hash potions to hash table
+        self.catalog = PotionCatalog.from_potion_data(potion_data)
+
+    def save_potion_data(self, path: str) -> None:
+        """
+        This saves the total potion data for the game, including the litres of each potion added to the inventory so
+            far, to a snapshot file at path that load_potion_data can read back.
+
+        Complexity: O(N), where N is the number of potions in the game
+        """
+        save_catalog_snapshot(self.catalog, path)
+
+    def load_potion_data(self, path: str, verify: bool = True) -> None:
+        """
+        This sets the total potion data for the game from a snapshot file saved by save_potion_data, instead of
+            calling set_total_potion_data. The file is mapped into memory rather than read, so no name is hashed until
+            it is looked up, and processes loading the same file share it.
+
+        Complexity: O(T), or O(F) with verify, where T is the total length of the potion types and F is the size of
+            the file
+        :raises ValueError: when the snapshot is stale or corrupt
+        """
+        self.catalog = CatalogSnapshot(path, verify)
 
     def add_potions_to_inventory(self, potion_name_amount_pairs: list[tuple[str, float]]) -> None:
         """
@@ -65,73 +97,149 @@ class Game:
 
         Complexity analysis:
             Why it is the complexity it is: This is O(C*log(n)) complexity due to the ADTs we have selected and
-                used. The initial for loop is O(C) complexity, the most expensive operation in the loop, is adding
-                elements to AVLTree: self.vendor_company_tree, which is O(log(n)). Hashing with our good hash method
-                has an average complexity of linear time, O(1). Therefore the overall complexity of this function is
-                O(C*log(n)). However, if the bad_hash function was used this would have a poorer time complexity.
-        """
-        self.vendor_company_hash = LinearProbePotionTable(
-            len(potion_name_amount_pairs))  # Initialise hash table for vendors
-        for i in range(len(potion_name_amount_pairs)):
-            key = potion_name_amount_pairs[i][0]
-            potion_attributes = self.potions_hash[key]  # Find details about potion via key we are given
-            litres = potion_name_amount_pairs[i][1]
-            potion_attributes.quantity += litres  # Update val (potion) litres accordingly
-            self.vendor_company_tree[potion_attributes.buy_price] = potion_name_amount_pairs[
-                i]  # Set tree values in vendor inventory based on price
-            self.vendor_company_hash[
-                key] = potion_attributes  # Add items to hash table for vendors, include litres of potion
-
-    def choose_potions_for_vendors(self, num_vendors: int) -> list:
+                used. The initial for loop is O(C) complexity. Hashing with our good hash method has an average
+                complexity of linear time, O(1). The potions are then added to AVLTree: self.vendor_company_tree.
+                When the vendor inventory is empty, as it is when the game starts, the whole batch is loaded at once
+                with AVLTree.from_items, which is a single O(C*log(C)) sort followed by an O(C) build. Otherwise
+                each potion is added one at a time, which is O(log(n)) each. Therefore the overall complexity of
+                this function is O(C*log(n)). However, if the bad_hash function was used this would have a poorer
+                time complexity. The vendor hash table is only created on the first call, and is updated in place
+                (growing when needed) after that. Both hash tables are read and written a whole batch at a time, so
+                every name is hashed once per table and a repeated name is only looked up once. The litres of each
+                potion are added to its entry in the quantities column of the catalog.
+        """
+        if self.vendor_company_hash is None:
+            self.vendor_company_hash = LinearProbePotionTable(
+                len(potion_name_amount_pairs))  # Initialise hash table for vendors
+        keys = [key for key, _ in potion_name_amount_pairs]
+        potion_ids = self.catalog.ids_of(keys)  # Find the id of each potion via key we are given
+        buy_prices = self.catalog.buy_prices
+        quantities = self.catalog.quantities
+        tree_pairs = []
+        for potion_id, pair in zip(potion_ids, potion_name_amount_pairs):
+            quantities[potion_id] += pair[1]  # Update potion litres accordingly
+            tree_pairs.append((buy_prices[potion_id], pair))  # Tree values in vendor inventory are based on price
+        self.vendor_company_hash.set_many(zip(keys, potion_ids))  # Add the id of each potion to hash table for vendors
+
+        if self.vendor_company_tree.is_empty():
+            self.vendor_company_tree = AVLTree.from_items(tree_pairs)  # Bulk load the whole batch
+        else:
+            for buy_price, pair in tree_pairs:
+                self.vendor_company_tree[buy_price] = pair
+
+    def remove_potions_from_inventory(self, potion_names: list[str]) -> None:
+        """
+        This function removes discontinued potions from the inventory of the vendor corporation, leaving them with
+            0 litres.
+
+        potion_names: The names of the potions to remove
+
+        Complexity: O(C * log(N)), where C is equal to length of potion_names, and N is number of potions in the
+            vendor inventory.
+
+        Complexity analysis:
+            Each potion is found and deleted from self.vendor_company_hash, which is amortised O(1) with a good hash
+                function as deletion only leaves a tombstone, and deleted from self.vendor_company_tree by its price,
+                which is O(log(n)).
+        :raises KeyError: when a potion is not in the vendor inventory
+        """
+        for key, potion_id in zip(potion_names, self.vendor_company_hash.get_many(potion_names)):
+            del self.vendor_company_tree[self.catalog.buy_prices[potion_id]]
+            del self.vendor_company_hash[key]
+            self.catalog.quantities[potion_id] = 0
+
+    def choose_potions_for_vendors(self, num_vendors: int, rand_gen: RandomGen = None) -> list:
         """
         This function chooses the potions which vendors will sell each day
 
         num_vendors: This represents the number of vendors that will play in the game
+        rand_gen: The RandomGen to draw from, which is moved on by one number per potion. Defaults to a new
+            RandomGen(), as before, and can be given one that has been advanced or split to run a shard of a larger
+            simulation
 
-        Output: list of tuple(name of potion, how much potion)
+        Output: list of tuple(name of potion, how much potion). Each vendor takes the randint(C)'th most expensive
+            of the C potions still available. The AVL selection this replaced did not, from the very first draw, so
+            the output differs from it for the same random numbers.
 
-        Complexity: O(C * log(N)) Where C is equal to num_vendors, and N is number of potions provided in set_total_potion_data.
+        Complexity: O(C * log(C)) Where C is the number of potions in the vendor inventory.
 
         Complexity analysis:
-            Why it is the complexity it is: The complexity is O(C*log(n)), when looking at the code, our while loop will
-            until the length of the vendor company tree is 0, therefore, the complexity of this loop is O(C). Inside this
-            loop, the most expensive function we have is deleting an item from the tree, and getting the kth largest item,
-            both of these operations are O(log(n)). Additionally there is a for loop after the while loop. This loop
-            adds the items back to the vendor tree with 0 quantity, it has several operations within it of log(n), but
-            they are a set amount of operations and do not increase with the input size. The complexity of this loop is
-            O(C*log(n)). This means the overall complexity is O(C*log(n)).
+            Why it is the complexity it is: The potions in vendor_company_tree are read out in order of price once,
+            which is O(C), and a FenwickTree counting which of them are still available is built over their price
+            ranks, which is also O(C). The while loop then runs until every potion has been chosen, so it runs C times.
+            Inside this loop, finding the position of the kth most expensive potion still available and marking it as
+            taken are both O(log(C)) in the FenwickTree, so the loop is O(C*log(C)). The AVL tree itself is never
+            changed, so nothing has to be deleted or added back. Finally every chosen potion is set to 0 litres in
+            place in the tree and in the catalog, which is O(C) with a good hash function. This means the
+            overall complexity is O(C*log(C)).
         """
         output = []  # Initialise empty list to fill with potion names and values
         if num_vendors < 1:
             raise ValueError
-        rand_gen = RandomGen()
-        while self.vendor_company_tree.length != 0:  # Iterate backwards so that each time a potion is deleted, we can get the right size random int
-            rand_num = rand_gen.randint(self.vendor_company_tree.length)
-            kth_larg = self.vendor_company_tree.kth_largest(rand_num).key  # Get the kth_largest elements key
-            output.append((self.vendor_company_tree[kth_larg], kth_larg))  # Add the tuple to output list
-            del self.vendor_company_tree[kth_larg]  # Delete item from vendor inventory
-
-        # Add back to vendor inventory O(C*log(n))
-        for i in range(len(output)):
-            # Update vendor tree without litres O(log(n)
-            item_without_litres = (output[i][0][0], 0)  # Updating tree for vendor corporation to have 0 litres
-            self.vendor_company_tree[
-                output[i][1]] = item_without_litres  # Updating tree for vendor corporation to have 0 litres
-
-            # Update vendor hash without litres O(log(n)
-            key = str(output[i][0][0])  # This is our hash key, the name of the potion
-            hash_val = self.vendor_company_hash[key]
-            hash_val.quantity = 0  # Set quantity of potions in vendor hash to be 0
-            item_without_litres = self.vendor_company_hash[key]
-            item_without_litres.quantity = 0
-            self.vendor_company_hash[key] = item_without_litres
-
-            output[i] = output[i][0]  # Set output to not include other fluff
+        if rand_gen is None:
+            rand_gen = RandomGen()
+        nodes = self.vendor_company_tree.get_nodes_in_order()  # Cheapest to most expensive
+        available = FenwickTree([1] * len(nodes))  # 1 for every potion that has not been chosen yet
+        while available.total != 0:
+            rand_num = rand_gen.randint(available.total)
+            kth_larg = available.select(available.total - rand_num + 1)  # Position of the kth most expensive left
+            output.append(nodes[kth_larg].item)  # Add the (name, litres) tuple to output list
+            available.add(kth_larg, -1)  # Mark it as chosen
+
+        # Set vendor inventory to 0 litres in place O(C)
+        keys = []
+        for node in nodes:
+            key = node.item[0]  # This is our hash key, the name of the potion
+            node.item = (key, 0)  # Updating tree for vendor corporation to have 0 litres
+            keys.append(key)
+        quantities = self.catalog.quantities
+        for potion_id in self.vendor_company_hash.get_many(keys):
+            quantities[potion_id] = 0  # Set quantity of potions in the catalog to be 0
         return output
 
-    def solve_game(self, potion_valuations: list[tuple[str, float]], starting_money: list[int]) -> list[float]:
+    def rank_profitable_potions(self, potion_valuations: list[tuple[str, float]]) -> list[list]:
         """
-        This function adds potions to an AVL tree, based on the profitability of buying and selling them. It then
+        This function finds the potions that can be sold to adventurers for more than PotionCorp sells them for, and
+            ranks them from most to least profitable.
+
+        Args:
+            potion_valuations: This is a list that shows the name of the potion, and how much the adventurers are
+            willing to purchase for
+
+        Returns: A list of [amount_purchasable, profit_factor, key] for every profitable potion, sorted by
+            (profit_factor, key) from largest to smallest. Unprofitable potions are left out.
+
+        Complexity: O(N*log(N)) Where N is length of potion_valuations.
+
+        Complexity analysis:
+            The first loop runs N times, and retrieves the id of each potion from self.vendor_company_hash,
+            which is a hash table with the ability to access elements in constant time if a good hash function is
+            used, and then its price and litres from the columns of self.catalog, so the loop is O(N). The
+            profitable potions are then ranked with a single sort of the compact records, which is O(N*log(N)).
+            This replaces inserting every potion into an AVL tree and then calling kth_largest once per potion,
+            which costs the same O(N*log(N)) but with a far larger constant.
+        """
+        sorted_list_of_potions = []
+        potion_ids = self.vendor_company_hash.get_many([key for key, _ in potion_valuations])
+        buy_prices = self.catalog.buy_prices
+        quantities = self.catalog.quantities
+        for (key, adventurer_buy_price), potion_id in zip(potion_valuations, potion_ids):
+            sell_price_vendor = buy_prices[potion_id]  # Retrieve price from vendor
+
+            # Finding profit factor and keeping the potion only if it is profitable
+            if sell_price_vendor < adventurer_buy_price:
+                profit_factor = (
+                        adventurer_buy_price / sell_price_vendor)  # Gives percentage of returns (gross profit) that will be made per unit purchased
+                amount_purchasable = quantities[potion_id] * sell_price_vendor
+                sorted_list_of_potions.append([amount_purchasable, profit_factor, key])
+
+        sorted_list_of_potions.sort(key=itemgetter(1, 2), reverse=True)  # Most profitable first, ties by key
+        return sorted_list_of_potions
+
+    def solve_game(self, potion_valuations: list[tuple[str, float]], starting_money: list[int],
+                   days_sorted: bool = False) -> list[float]:
+        """
+        This function ranks potions based on the profitability of buying and selling them. It then
             proceeds to iterate through the potions, buying as much as possible, and then going to the next potion,
             or day. It returns the maximum amount of money that can be made, by buying potions from PotionCorp, and
             selling potions to adventurers, on any given day, with a set amount of money.
@@ -139,70 +247,177 @@ class Game:
         Args:
             potion_valuations: This is a list that shows the name of the potion, and how much the adventurers are
             willing to purchase for starting_money: This shows the players amount of money per day
+            days_sorted: True if starting_money is in non-decreasing order, so all days can be answered in one merge
+            pass
 
         Returns: A list of the players total money at the end of each day played, indexed by day.
 
-        Complexity: O(N*M + N*log(N)) Where N is length of potion_valuations, and M is the length of starting_money.
+        Complexity: O(M*log(N) + N*log(N)) Where N is length of potion_valuations, and M is the length of
+            starting_money.
 
         Complexity analysis:
-            This function has used the ADT of AVL tree, due to its self balancing nature, and ability
-            to get a kth largest element with O(log(n)) complexity. The first for loop is of complexity N*log(n),
-            as it runs N times, and each time an item is added to profit_tree, it costs O(log(N)). The overall complexity
-            of the first loop is O(N * log(n)), where n is the amount of nodes in the tree. To keep this complexity we
-            needed to retrieve the details of the items from self.vendor_company_hash, which is a hash table with the
-            ability to access elements in constant time if a good hash function is used.
+            The profitable potions are ranked by rank_profitable_potions, which is O(N*log(N)) (see there).
 
-            The second loop is of complexity: The loop runs N times, each call to kth_largest is log(n).
-            Therefore it runs O(N* log(n)) times. This takes every kth element and adds it to a regular list.
-            This produces a sorted list of elements from most profitable to least profitable.
+            The days are then answered by a ProfitSolver, which builds cumulative spend and profit arrays over the
+            sorted list in O(N). Each day is a binary search over the cumulative spend followed by one partial
+            purchase, which is O(log(N)), so answering all of the days is O(M*log(N)). If the days are given sorted,
+            they are answered in a single O(N + M) merge pass instead.
 
-            Third loop complexity: The first loop runs M times, the second loop runs N times. Every operation within
-            the second loop is constant. This means the overall complexity of this function is O(M*N)
+            When NumPy is installed and there are at least numpy_threshold valuations, the ranking and the days
+            are done with NumPy array operations instead (see NumpyProfitSolver). The complexity is the same, but
+            the work is vectorised.
 
-            This gives us an overall complexity of O(2(N*log(n))+M*N) complexity, which ends up being O(N*M + N*log(N)).
+            This gives us an overall complexity of O(N*log(N) + N + M*log(N)), which ends up being
+            O(M*log(N) + N*log(N)).
         """
-        profit_tree = AVLTree()
+        if NUMPY_AVAILABLE and len(potion_valuations) >= self.numpy_threshold:
+            return self.solve_game_numpy(potion_valuations, starting_money, days_sorted)
 
-        # This section is O(n*log(n))
-        for i in range(len(potion_valuations)):  # Iterate through potions finding the profitability factor of given day
-            # Checking if the potion is profitable
-            key = potion_valuations[i][0]  # The name of the potion
-            sell_price_vendor = self.vendor_company_hash[key].buy_price  # Retrieve price from vendor
-            adventurer_buy_price = potion_valuations[i][1]  # What price will the adventurers buy at
+        # Rank the profitable potions, this section is O(n*log(n))
+        sorted_list_of_potions = self.rank_profitable_potions(potion_valuations)
 
-            # Finding profit factor and storing in tree if it is profitable
-            if sell_price_vendor < adventurer_buy_price:
-                vendor_quantity = self.vendor_company_hash[key].quantity
-                profit_factor = (
-                        adventurer_buy_price / sell_price_vendor)  # Gives percentage of returns (gross profit) that will be made per unit purchased
-                amount_purchasable = vendor_quantity * sell_price_vendor
-                profit_tree[profit_factor, key] = [amount_purchasable, profit_factor, key]
+        # Here is where we solve the puzzle, and find out how much money can be made
+        # This section is O(n + m x log(n)) complexity, or O(n + m) when the days are already sorted.
+        solver = ProfitSolver(sorted_list_of_potions)
+        if days_sorted:
+            return solver.solve_sorted(starting_money)
+        return solver.solve(starting_money)
+
+    def solve_game_numpy(self, potion_valuations: list[tuple[str, float]], starting_money: list[int],
+                         days_sorted: bool = False) -> list[float]:
+        """
+        This function gives the same results as solve_game, but ranks the potions and answers the days with NumPy
+            array operations. It needs NumPy to be installed.
 
-        # Here is where we take the objects out of the tree, they will be sorted in the list now.
-        # This section is O(n x log(n)) complexity
-        sorted_list_of_potions = []
-        for i in range(len(potion_valuations)):
-            kth_largest = profit_tree.kth_largest(i + 1)
-            sorted_list_of_potions.append(kth_largest.item)
+        Args:
+            potion_valuations: This is a list that shows the name of the potion, and how much the adventurers are
+            willing to purchase for starting_money: This shows the players amount of money per day
+            days_sorted: True if starting_money is in non-decreasing order. The days are answered the same way
+            either way, but the order is checked, as solve_game checks it
 
-        # Here is where we solve the puzzle, and find out how much money can be made
-        # This section is O(n x m) complexity.
-        profit_output = []
-        profit_for_day = 0
-        for i in range(len(starting_money)):  # O(m) complexity for this loop, if we disregard the nested loop.
-            money_for_day = starting_money[i]
-            for j in range(len(sorted_list_of_potions)):  # O(n) complexity, all lines in this loop are constant time
-                if money_for_day == 0:
-                    break
-                if sorted_list_of_potions[j][0] > money_for_day:  # If there is more than I'm able to purchase
-                    profit_for_day += money_for_day * sorted_list_of_potions[j][1]  # Return amount I'm able to purchase times profit factor
-                    break
-                else:  # If player can purchase all of the potion that there is and still have leftover money
-                    profit_for_day += sorted_list_of_potions[j][0] * sorted_list_of_potions[j][1]  # Return amount available for purchase times profit factor
-                    money_for_day -= sorted_list_of_potions[j][0]
-
-            # Append profit made for day to output list
-            profit_output.append(profit_for_day)
-            profit_for_day = 0
-
-        return profit_output
+        Returns: A list of the players total money at the end of each day played, indexed by day.
+
+        Complexity: O(M*log(N) + N*log(N)) Where N is length of potion_valuations, and M is the length of
+            starting_money.
+
+        Complexity analysis:
+            Only the loop that looks up the id of each potion in self.vendor_company_hash is done in Python, which is
+            O(N) with a good hash function. Gathering the prices and litres from the catalog columns, the filter,
+            profit factors, sort, cumulative sums and the binary search for every day are done by NumPy.
+        :raises ValueError: when days_sorted is True but starting_money is not sorted
+        """
+        solver = self.numpy_profit_solver(potion_valuations)
+        if days_sorted:
+            return solver.solve_sorted(starting_money)
+        return solver.solve(starting_money)
+
+    def numpy_profit_solver(self, potion_valuations: list[tuple[str, float]]) -> NumpyProfitSolver:
+        """
+        This function looks up the id of each valued potion in the vendor inventory, and hands them with the price
+            and quantity columns of the catalog to a NumpyProfitSolver to rank. It needs NumPy to be installed.
+
+        Complexity: O(N*log(N)) Where N is length of potion_valuations.
+        """
+        keys = [key for key, _ in potion_valuations]
+        return NumpyProfitSolver.from_columns(self.catalog.buy_prices, self.catalog.quantities,
+                                              self.vendor_company_hash.get_many(keys),
+                                              [adventurer_buy_price for _, adventurer_buy_price in potion_valuations],
+                                              keys)
+
+    def solve_game_iter(self, potion_valuations: list[tuple[str, float]], starting_money: Iterable[float],
+                        chunk_size: int = 4096) -> Iterator[float]:
+        """
+        This function gives the same results as solve_game, but takes the starting money from any iterable and
+            gives back an iterator, so days can be streamed from a file or socket into an output sink without ever
+            holding them all in memory. For example:
+
+                for profit_for_day in game.solve_game_iter(valuations, (float(line) for line in day_log)):
+                    sink.write(str(profit_for_day) + "\n")
+
+        Args:
+            potion_valuations: This is a list that shows the name of the potion, and how much the adventurers are
+            willing to purchase for starting_money: This shows the players amount of money per day
+            chunk_size: How many days are read ahead and answered together. Use 1 to answer each day as soon as
+            it arrives
+
+        Returns: An iterator over the players total money at the end of each day played, in day order.
+
+        Complexity: O(M*log(N) + N*log(N)) Where N is length of potion_valuations, and M is the number of days.
+            Memory is O(N + chunk_size), however many days there are.
+
+        Complexity analysis:
+            The potions are ranked once, when this function is called, exactly as solve_game ranks them. The days
+                are then read chunk_size at a time and answered by the same solver, so each chunk is O(chunk_size *
+                log(N)).
+        """
+        if NUMPY_AVAILABLE and len(potion_valuations) >= self.numpy_threshold:
+            solver = self.numpy_profit_solver(potion_valuations)
+        else:
+            solver = ProfitSolver(self.rank_profitable_potions(potion_valuations))
+        return solve_in_chunks(solver, starting_money, chunk_size)
+
+    def solve_many(self, scenarios: list[tuple[list[tuple[str, float]], list[int]]], workers: int = None,
+                   chunksize: int = None) -> list[list[float]]:
+        """
+        This function plays solve_game for many what-if scenarios against the current vendor inventory, spreading
+            them across worker processes.
+
+        Args:
+            scenarios: A list of (potion_valuations, starting_money) pairs, each as solve_game takes them
+            workers: The number of worker processes, defaults to the number of CPUs
+            chunksize: The number of scenarios sent to a worker at a time, defaults to about four chunks per worker
+
+        Returns: The list solve_game returns for each scenario, in the same order as scenarios.
+
+        Complexity: O(S*(M*log(N) + N*log(N)) / W + V) Where S is length of scenarios, N and M are the largest
+            lengths of potion_valuations and starting_money in a scenario, W is workers and V is the number of potions
+            in the vendor inventory.
+
+        Complexity analysis:
+            The vendor inventory is flattened into a list once, O(V), and handed to each worker process once when it
+                starts, where it is loaded back into a catalog. Each scenario after that only sends its own
+                valuations and starting money. When there is one worker, or fewer than solve_many_serial_threshold
+                scenarios, they are solved in this process instead.
+        """
+        if workers is None:
+            workers = cpu_count()
+        if workers <= 1 or len(scenarios) < self.solve_many_serial_threshold:
+            return [self.solve_game(potion_valuations, starting_money)
+                    for potion_valuations, starting_money in scenarios]
+
+        if chunksize is None:
+            chunksize = max(1, len(scenarios) // (workers * 4))
+        inventory = [(self.catalog.potion_types[self.catalog.type_ids[potion_id]], name,
+                      self.catalog.buy_prices[potion_id], self.catalog.quantities[potion_id])
+                     for name, potion_id in self.vendor_company_hash.items()]
+        with Pool(workers, initializer=_init_solve_worker, initargs=(inventory, self.numpy_threshold)) as pool:
+            return pool.map(_solve_scenario, scenarios, chunksize)
+
+
+# The game each solve_many worker process plays its scenarios with, set up once by _init_solve_worker
+_worker_game = None
+
+
+def _init_solve_worker(inventory: list[tuple[str, str, float, float]], numpy_threshold: int) -> None:
+    """
+    Runs once in each solve_many worker process, loading the vendor inventory given as
+        (potion_type, name, buy_price, quantity) tuples. numpy_threshold is that of the game solve_many was called
+        on, so the workers pick the same backend as its solve_game would.
+
+    Complexity: O(V) Where V is length of inventory.
+    """
+    global _worker_game
+    _worker_game = Game()
+    _worker_game.numpy_threshold = numpy_threshold
+    _worker_game.catalog = PotionCatalog(len(inventory))
+    _worker_game.catalog.add_many([(name, potion_type, buy_price) for potion_type, name, buy_price, _ in inventory],
+                                  [quantity for _, _, _, quantity in inventory])
+    _worker_game.vendor_company_hash = _worker_game.catalog.ids  # Every potion in the catalog is in the inventory
+
+
+def _solve_scenario(scenario: tuple[list[tuple[str, float]], list[int]]) -> list[float]:
+    """
+    Solves one (potion_valuations, starting_money) scenario in a solve_many worker process.
+    """
+    potion_valuations, starting_money = scenario
+    return _worker_game.solve_game(potion_valuations, starting_money)
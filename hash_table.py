@@ -1,48 +1,108 @@
 """ Hash Table ADT
 
 Defines a Hash Table using Linear Probing for conflict resolution.
-It currently rehashes the primary cluster to handle deletion, it has a statistics method returning statistics from linear probing.
+It grows and rehashes into a larger prime sized table once it is loaded past its maximum load factor.
+It handles deletion by leaving tombstones, which are cleared out by rehashing once there are too many of them.
+It has a statistics method returning statistics from linear probing.
+It can optionally use Robin Hood insertion, which keeps probe distances even and lets failed lookups stop early.
+Per-operation instrumentation can be turned on and off while the table is in use.
+It can optionally store its keys, cached hash positions and data in parallel arrays instead of a tuple per item.
 """
+from __future__ import annotations
+
 __author__ = 'Brendon Taylor, modified by Jackson Goerner, modified again by Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh '
 __docformat__ = 'reStructuredText'
 __modified__ = '21/05/2020'
 __since__ = '14/05/2020'
 
+from array import array
 from referential_array import ArrayR
 from typing import TypeVar, Generic
 from potion import Potion
+from primes import next_prime
+from table_instrumentation import TableInstrumentation
 
 T = TypeVar('T')
 
+# Marks a slot whose item was deleted, so that probing carries on past it
+TOMBSTONE = object()
+
 
 class LinearProbePotionTable(Generic[T]):
     """
     Linear Probe Potion Table
 
-    This potion table does not support deletion.
+    Deleted items leave a TOMBSTONE in their slot, which lookups probe past and inserts reuse.
+
+    With robin_hood set, an insert takes the slot of any item that is closer to its own hash position than the new
+        item is, and moves that item on instead. Items then stay sorted by home position along each cluster, so a
+        lookup can stop as soon as it reaches an item closer to home than it is, and deletion shifts the rest of
+        the cluster back instead of leaving tombstones.
+
+    With compact set, there are no (key, data) tuples. The keys, the hash position of each key and the data are
+        kept in three parallel arrays instead, so updating an item writes its data in place, and probing compares
+        the cached hash position of a slot before comparing its key.
 
     attributes:
         count: number of elements in the hash table
-        table: used to represent our internal array
+        tombstones: number of slots holding a TOMBSTONE
+        table: used to represent our internal array, holding only the keys with compact
         table_size: current size of the hash table
         probe_max: The maximum linear probe chain length of all inserted items in the linear probe potion table
         conflict_count: The amount of conflicts that occur when inserting items into table
         good_hash: Boolean value == True if good_hash function will be used, otherwise False.
+        max_load_factor: The table grows before an insert would take count above max_load_factor * table_size.
+            It must be above 0 and at most 1. None means the table never grows, and raises ValueError when full.
+        resize_count: The number of times the table has been rehashed, to grow or to clear tombstones
+        robin_hood: Boolean value == True if Robin Hood insertion is used, otherwise False
+        distances: Only with robin_hood, how far the item in each slot is from its hash position
+        compact: Boolean value == True if the parallel array storage is used, otherwise False
+        homes: Only with compact, the hash position of the key in each slot, or -1 for an empty or deleted slot
+        values: Only with compact, the data of the key in each slot
+        instrumentation: A TableInstrumentation recording every lookup and insert, or None when turned off
     """
 
-    def __init__(self, max_potions: int, good_hash: bool = True, tablesize_override: int = -1) -> None:
+    def __init__(self, max_potions: int, good_hash: bool = True, tablesize_override: int = -1,
+                 max_load_factor: float = 0.75, robin_hood: bool = False, compact: bool = False) -> None:
+        if robin_hood and compact:
+            raise ValueError("Robin Hood insertion cannot be used with compact storage.")
+        if max_load_factor is not None and not 0 < max_load_factor <= 1:
+            raise ValueError("The maximum load factor must be above 0 and at most 1, not {0}.".format(max_load_factor))
         # Statistic setting
         self.conflict_count = 0
         self.probe_max = 0
         self.probe_total = 0
         self.count = 0
+        self.tombstones = 0
         self.good_hash = good_hash
+        self.max_load_factor = max_load_factor
+        self.resize_count = 0
+        self.robin_hood = robin_hood
+        self.compact = compact
+        self.instrumentation = None
 
         if tablesize_override == -1:
             self.table_size = max_potions * 2  # If user does not input a table size, select appropriate table size given number of max_potions
         else:
             self.table_size = tablesize_override
-        self.table = ArrayR(self.table_size)
+        self.distances = ArrayR(self.table_size) if robin_hood else None
+        self.homes = None
+        self.values = None
+        self.__allocate(self.table_size)
+
+    def __allocate(self, tablesize: int) -> None:
+        """
+        Sets up empty storage for tablesize slots.
+        :complexity: O(N) where N is tablesize
+        """
+        if self.compact:
+            if tablesize <= 0:
+                raise ValueError("Array length should be larger than 0.")
+            self.table = [None] * tablesize
+            self.homes = array('i', [-1]) * tablesize  # Table sizes stay well below 2^31
+            self.values = [None] * tablesize
+        else:
+            self.table = ArrayR(tablesize)
 
     def hash(self, potion_name: str) -> int:
         """
@@ -57,17 +117,85 @@ class LinearProbePotionTable(Generic[T]):
         elif self.good_hash is False:
             return Potion.bad_hash(potion_name, self.table_size)
 
-    def statistics(self) -> tuple:
+    def hash_many(self, potion_names: list[str]) -> list[int]:
+        """
+        This function gives the hash of every name in potion_names, in the same order, in one pass. When hash has
+            been replaced, by a subclass or on the class, every name is hashed with it instead, so the batch methods
+            always agree with the single key ones.
+
+        Time complexity (Best and worst): O(total length of potion_names)
+        """
+        if type(self).hash is not DEFAULT_HASH:
+            return [self.hash(potion_name) for potion_name in potion_names]
+        if self.good_hash:
+            return Potion.hash_many(potion_names, self.table_size)
+        return [Potion.bad_hash(potion_name, self.table_size) for potion_name in potion_names]
+
+    def statistics(self, with_distribution: bool = False) -> tuple:
         """
         This function returns the statistics on linear probing in the potion table.
             It gives us the amount of conflicts, total linear probe length, and the
             longest linear probing instance. This gives us information on the effectiveness
-            of the hash function used.
+            of the hash function used. The counts are for every insert and lookup made on the table since it was
+            created, and moving items into a new table when it grows does not add to them.
+
+        If with_distribution is True, the probe_distribution() of the items in the table is added as a fourth value.
 
-        Time complexity: O(1)
+        Time complexity: O(1), or O(N) where N is the table size with with_distribution
         """
+        if with_distribution:
+            return self.conflict_count, self.probe_total, self.probe_max, self.probe_distribution()
         return self.conflict_count, self.probe_total, self.probe_max
 
+    def enable_instrumentation(self, max_offenders: int = 10) -> None:
+        """
+        Starts recording the number of probes of every lookup and insert, keeping the max_offenders keys that took
+            the most probes. Counters are kept if it is already on.
+        :complexity: O(1)
+        """
+        if self.instrumentation is None:
+            self.instrumentation = TableInstrumentation(max_offenders)
+
+    def disable_instrumentation(self) -> None:
+        """
+        Stops recording, and throws away the counters.
+        :complexity: O(1)
+        """
+        self.instrumentation = None
+
+    def instrumentation_snapshot(self, reset: bool = False) -> dict:
+        """
+        Returns a copy of the instrumentation counters, setting them back to zero at the same time with reset.
+        :see: #TableInstrumentation.snapshot(reset: bool)
+        :raises ValueError: when instrumentation is turned off
+        """
+        if self.instrumentation is None:
+            raise ValueError("Instrumentation is not enabled.")
+        return self.instrumentation.snapshot(reset)
+
+    def probe_distribution(self) -> list[int]:
+        """
+        This function returns a list where the value at index d is the number of items stored d slots past
+            their hash position, which is how many probes a successful lookup of them takes.
+
+        Time complexity: O(N) where N is the table size, plus hashing every key without robin_hood or compact
+        """
+        distribution = []
+        for position in range(len(self.table)):
+            item = self.table[position]
+            if item is None or item is TOMBSTONE:
+                continue
+            if self.compact:
+                distance = (position - self.homes[position]) % len(self.table)
+            elif self.robin_hood:
+                distance = self.distances[position]
+            else:
+                distance = (position - self.hash(item[0])) % len(self.table)
+            while len(distribution) <= distance:
+                distribution.append(0)
+            distribution[distance] += 1
+        return distribution
+
     def __len__(self) -> int:
         """
         Returns number of elements in the hash table
@@ -76,29 +204,30 @@ class LinearProbePotionTable(Generic[T]):
 
         return self.count
 
-    def __linear_probe(self, key: str, is_insert: bool) -> int:
+    def __linear_probe(self, key: str, home: int, is_insert: bool) -> int:
         """
-        Find the correct position for this key in the hash table using linear probing
+        Find the correct position for this key in the hash table using linear probing, where home is the hash of the key
         :complexity best: O(K) first position is empty
                           where K is the size of the key
         :complexity worst: O(K + N) when we've searched the entire table
                            where N is the table_size
         :raises KeyError: When a position can't be found
         """
-        position = self.hash(key)  # get the position using hash
+        position = home
         probe = 0
         check = True
-        if is_insert and self.is_full():
-            raise KeyError(key)
+        first_tombstone = None
         for _ in range(len(self.table)):  # start traversing
             if self.table[position] is None:  # found empty slot
                 if is_insert:
-                    return position
+                    return position if first_tombstone is None else first_tombstone  # reuse a deleted slot
                 else:
                     raise KeyError(key)  # so the key is not in
-            elif self.table[position][0] == key:  # found key
+            elif self.table[position] is not TOMBSTONE and self.table[position][0] == key:  # found key
                 return position
             else:  # there is something but not the key, try next
+                if self.table[position] is TOMBSTONE and first_tombstone is None:
+                    first_tombstone = position
                 position = (position + 1) % len(self.table)
                 probe += 1
                 self.probe_total += 1
@@ -108,8 +237,114 @@ class LinearProbePotionTable(Generic[T]):
                 self.conflict_count += 1
                 check = False
 
+        if is_insert and first_tombstone is not None:
+            return first_tombstone
         raise KeyError(key)
 
+    def __count_probe(self, probe: int) -> None:
+        """
+        Adds one probe, the probe'th of the current operation, to the statistics.
+        :complexity: O(1)
+        """
+        self.probe_total += 1
+        if probe > self.probe_max:
+            self.probe_max = probe
+        if probe == 1:
+            self.conflict_count += 1
+
+    def __compact_probe(self, key: str, home: int, is_insert: bool) -> int:
+        """
+        Find the correct position for this key in a compact table, where home is the hash of the key, using linear
+            probing. The key in a slot is only compared when the cached hash position of the slot is home.
+        :complexity best: O(K) first position is empty
+                          where K is the size of the key
+        :complexity worst: O(N + K * C) when we've searched the entire table
+                           where N is the table_size and C is the number of keys with the same hash
+        :raises KeyError: When a position can't be found
+        """
+        keys = self.table
+        homes = self.homes
+        size = len(keys)
+        position = home
+        probe = 0
+        first_tombstone = None
+        for _ in range(size):
+            slot_key = keys[position]
+            if slot_key is None:
+                if is_insert:
+                    return position if first_tombstone is None else first_tombstone
+                raise KeyError(key)
+            if homes[position] == home and slot_key == key:  # Deleted slots have a home of -1, so never match
+                return position
+            if slot_key is TOMBSTONE and first_tombstone is None:
+                first_tombstone = position
+            position += 1
+            if position == size:
+                position = 0
+            probe += 1
+            self.__count_probe(probe)
+
+        if is_insert and first_tombstone is not None:
+            return first_tombstone
+        raise KeyError(key)
+
+    def __robin_hood_probe(self, key: str, home: int) -> int:
+        """
+        Find the position of this key in a robin_hood table, where home is the hash of the key.
+            The search stops at an empty slot, or at an item that is closer to its hash position than the key
+            would be, as the key would have taken that slot when it was inserted.
+        :complexity best: O(K) first position holds the key
+                          where K is the size of the key
+        :complexity worst: O(K + N) where N is the length of the longest cluster
+        :raises KeyError: When the key is not in the table
+        """
+        position = home
+        distance = 0
+        for _ in range(len(self.table)):
+            item = self.table[position]
+            if item is None or self.distances[position] < distance:
+                raise KeyError(key)
+            elif item[0] == key:
+                return position
+            position = (position + 1) % len(self.table)
+            distance += 1
+            self.__count_probe(distance)
+        raise KeyError(key)
+
+    def __robin_hood_insert(self, key: str, data: T, home: int, count_probes: bool = True) -> None:
+        """
+        Set a (key, data) pair in a robin_hood table, where home is the hash of the key. Walking from the hash
+            position, the key is updated in place if it is found before any item closer to home than it. Otherwise
+            the new item takes the first such slot, and the item it displaces carries on looking for a slot of its
+            own in the same way.
+        :complexity best: O(K) first position is empty
+                          where K is the size of the key
+        :complexity worst: O(K + N) where N is the length of the longest cluster
+        :pre: the table is not full
+        """
+        position = home
+        distance = 0
+        entry = (key, data)
+        searching = True  # Until something is displaced, the key may already be in the table
+        while True:
+            item = self.table[position]
+            if item is None:
+                self.table[position] = entry
+                self.distances[position] = distance
+                self.count += 1
+                return
+            if searching and item[0] == key:
+                self.table[position] = entry
+                return
+            if self.distances[position] < distance:  # This item is richer, take its slot and move it on
+                searching = False
+                self.table[position], entry = entry, item
+                self.distances[position], distance = distance, self.distances[position]
+            position = (position + 1) % len(self.table)
+            distance += 1
+            if count_probes and searching:
+                self.__count_probe(distance)
+
     def __contains__(self, key: str) -> bool:
         """
         Checks to see if the given key is in the Hash Table
@@ -125,33 +360,331 @@ class LinearProbePotionTable(Generic[T]):
     def __getitem__(self, key: str) -> T:
         """
         Get the item at a certain key
-        :see: #self.__linear_probe(key: str, is_insert: bool)
+        :see: #self.__linear_probe(key: str, home: int, is_insert: bool)
         :raises KeyError: when the item doesn't exist
         """
-        position = self.__linear_probe(key, False)
+        if self.instrumentation is not None:
+            return self.__instrumented_getitem(key)
+        if self.compact:
+            return self.values[self.__compact_probe(key, self.hash(key), False)]
+        if self.robin_hood:
+            position = self.__robin_hood_probe(key, self.hash(key))
+        else:
+            position = self.__linear_probe(key, self.hash(key), False)
         return self.table[position][1]
 
+    def __instrumented_getitem(self, key: str) -> T:
+        """
+        Get the item at a certain key, recording the lookup as a hit or a miss
+        :raises KeyError: when the item doesn't exist
+        """
+        probes_before = self.probe_total
+        try:
+            position = self.__find(key, self.hash(key))
+        except KeyError:
+            self.instrumentation.record("miss", key, self.probe_total - probes_before)
+            raise
+        self.instrumentation.record("hit", key, self.probe_total - probes_before)
+        return self.__value_at(position)
+
+    def __find(self, key: str, home: int) -> int:
+        """
+        Find the position of this key, where home is the hash of the key
+        :complexity: O(K) with a good hash function, where K is the size of the key
+        :raises KeyError: When the key is not in the table
+        """
+        if self.compact:
+            return self.__compact_probe(key, home, False)
+        if self.robin_hood:
+            return self.__robin_hood_probe(key, home)
+        return self.__linear_probe(key, home, False)
+
+    def __value_at(self, position: int) -> T:
+        """
+        Returns the data of the item at position
+        :complexity: O(1)
+        """
+        return self.values[position] if self.compact else self.table[position][1]
+
+    def __store(self, position: int, key: str, data: T) -> None:
+        """
+        Replaces the data of key, which is already at position
+        :complexity: O(1)
+        """
+        if self.compact:
+            self.values[position] = data
+        else:
+            self.table[position] = (key, data)
+
     def __setitem__(self, key: str, data: T) -> None:
         """
         Set an (key, data) pair in our hash table
-        :see: #self.__linear_probe(key: str, is_insert: bool)
-        :see: #self.__contains__(key: str)
+        :see: #self.__linear_probe(key: str, home: int, is_insert: bool)
         """
-        if len(self) == len(self.table) and key not in self:
-            raise ValueError("Cannot insert into a full table.")
-        position = self.__linear_probe(key, True)
+        if self.instrumentation is None:
+            self.__set(key, data)
+            return
+        probes_before, count_before = self.probe_total, self.count
+        self.__set(key, data)
+        self.instrumentation.record("insert" if self.count > count_before else "update", key,
+                                    self.probe_total - probes_before)
+
+    def __set(self, key: str, data: T) -> None:
+        """
+        Set an (key, data) pair in our hash table, growing or clearing tombstones first if needed. When the table
+            would have to make room or is full, the key is looked for first, so updating an existing key never
+            rehashes the table.
+        """
+        home = self.hash(key)
+        if self.__is_crowded(1) or len(self) == len(self.table):
+            statistics = (self.probe_total, self.probe_max, self.conflict_count)
+            try:
+                position = self.__find(key, home)  # Not through __contains__, which would record a lookup
+            except KeyError:
+                # The insert below probes the same slots again, so they are only counted once
+                self.probe_total, self.probe_max, self.conflict_count = statistics
+            else:
+                self.__store(position, key, data)
+                return
+            tablesize = len(self.table)
+            self.__make_room(1)
+            if len(self) == len(self.table):
+                raise ValueError("Cannot insert into a full table.")
+            if len(self.table) != tablesize:
+                home = self.hash(key)  # Every hash depends on the table size
+        self.__place(key, data, home)
+
+    def __is_crowded(self, new_keys: int) -> bool:
+        """
+        Checks whether adding new_keys more keys would load the table, tombstones included, past max_load_factor
+        :complexity: O(1)
+        """
+        return self.max_load_factor is not None and \
+            self.count + self.tombstones + new_keys > self.max_load_factor * len(self.table)
+
+    def __make_room(self, new_keys: int) -> None:
+        """
+        Rehashes the table if adding new_keys more keys would load it past max_load_factor, growing it until they fit,
+            or only clearing out the tombstones if they are all that is in the way.
+        :complexity: O(1), or O(N) when the table is rehashed, where N is the table size
+        """
+        if self.__is_crowded(new_keys):
+            if self.count + new_keys > self.max_load_factor * len(self.table):
+                tablesize = len(self.table)
+                while self.count + new_keys > self.max_load_factor * tablesize:
+                    tablesize = next_prime(tablesize * 2)  # Grow before the table gets too full
+                self.rehash(tablesize)
+            else:
+                self.rehash(len(self.table))  # Only tombstones are in the way, so clear them out
+
+    def __place(self, key: str, data: T, home: int) -> None:
+        """
+        Set an (key, data) pair in our hash table, where home is the hash of the key
+        :complexity: O(K) with a good hash function, where K is the size of the key
+        :pre: the table has room for the key
+        """
+        if self.robin_hood:
+            self.__robin_hood_insert(key, data, home)
+            return
+        if self.compact:
+            self.__compact_set(key, data, home)
+            return
+        position = self.__linear_probe(key, home, True)
 
         if self.table[position] is None:
             self.count += 1
+        elif self.table[position] is TOMBSTONE:
+            self.count += 1
+            self.tombstones -= 1
         self.table[position] = (key, data)
 
+    def __compact_set(self, key: str, data: T, home: int) -> None:
+        """
+        Set a (key, data) pair in a compact table, where home is the hash of the key. An existing key only has its
+            data replaced.
+        :complexity: O(K) with a good hash function, where K is the size of the key
+        :pre: the table has room for the key
+        """
+        position = self.__compact_probe(key, home, True)
+        slot_key = self.table[position]
+        if slot_key is None or slot_key is TOMBSTONE:
+            if slot_key is TOMBSTONE:
+                self.tombstones -= 1
+            self.count += 1
+            self.table[position] = key
+            self.homes[position] = home
+        self.values[position] = data
+
+    def get_many(self, keys: list[str]) -> list[T]:
+        """
+        Get the item at every key in keys, in the same order. The keys are hashed together, and a key that is
+            repeated in keys is only looked up once.
+        :complexity: O(K) with a good hash function, where K is the total size of the keys
+        :raises KeyError: when one of the items doesn't exist
+        """
+        unique = list(dict.fromkeys(keys))
+        if self.instrumentation is not None:  # Look each key up on its own, so every lookup is recorded
+            found = {key: self[key] for key in unique}
+        else:
+            found = {key: self.__value_at(self.__find(key, home)) for key, home in zip(unique, self.hash_many(unique))}
+        return [found[key] for key in keys]
+
+    def set_many(self, pairs: list[tuple[str, T]]) -> None:
+        """
+        Set every (key, data) pair in pairs, with a later pair for a key replacing an earlier one, as if they were
+            set one at a time. The keys are hashed together, existing keys are updated where they are, and the
+            table grows at most once, to fit all of the new keys.
+        :complexity: O(K) with a good hash function, where K is the total size of the keys, plus O(N) if the table
+            is rehashed, where N is the table size
+        :raises ValueError: when the table cannot grow and the new keys don't fit, before anything is set
+        """
+        latest = dict(pairs)
+        if self.instrumentation is not None:  # Set each key on its own, so every insert and update is recorded
+            for key, data in latest.items():
+                self[key] = data
+            return
+        keys = list(latest)
+        homes = dict(zip(keys, self.hash_many(keys)))
+        found = []
+        missing = []
+        for key in keys:
+            try:
+                found.append((self.__find(key, homes[key]), key))
+            except KeyError:
+                missing.append(key)
+        if self.max_load_factor is None and self.count + len(missing) > len(self.table):
+            raise ValueError("Cannot insert into a full table.")
+
+        for position, key in found:
+            self.__store(position, key, latest[key])
+        if missing:
+            tablesize = len(self.table)
+            self.__make_room(len(missing))
+            if len(self.table) != tablesize:  # Every hash depends on the table size
+                homes = dict(zip(missing, self.hash_many(missing)))
+            for key in missing:
+                self.__place(key, latest[key], homes[key])
+
+    def update_many(self, keys: list[str], function) -> list[T]:
+        """
+        Replace the item at every key in keys with function(item), one key at a time in the order of keys, and
+            return the new items in the same order. A key that is repeated in keys is only looked up once, and
+            function is applied to its newest item each time.
+        :complexity: O(K + C) with a good hash function, where K is the total size of the keys and C is the cost of
+            calling function for each of them
+        :raises KeyError: when one of the items doesn't exist, before anything is changed
+        """
+        unique = list(dict.fromkeys(keys))
+        if self.instrumentation is not None:  # Look up and set each key on its own, so every operation is recorded
+            current = {key: self[key] for key in unique}
+            positions = None
+        else:
+            positions = {key: self.__find(key, home) for key, home in zip(unique, self.hash_many(unique))}
+            current = {key: self.__value_at(position) for key, position in positions.items()}
+        results = []
+        for key in keys:
+            current[key] = function(current[key])
+            results.append(current[key])
+        for key in unique:
+            if positions is None:
+                self[key] = current[key]
+            else:
+                self.__store(positions[key], key, current[key])
+        return results
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Delete the item at a certain key, leaving a TOMBSTONE in its slot.
+            Once a quarter of the table is tombstones, the table is rehashed to clear them.
+            With robin_hood, the items after it in its cluster are shifted back one slot instead.
+        :complexity: amortised O(K) with a good hash function, where K is the size of the key
+        :raises KeyError: when the item doesn't exist
+        """
+        if self.robin_hood:
+            self.__robin_hood_delete(key)
+            return
+        if self.compact:
+            position = self.__compact_probe(key, self.hash(key), False)
+            self.homes[position] = -1
+            self.values[position] = None  # Let go of the data straight away
+        else:
+            position = self.__linear_probe(key, self.hash(key), False)
+        self.table[position] = TOMBSTONE
+        self.count -= 1
+        self.tombstones += 1
+        if self.tombstones * 4 > len(self.table):
+            self.rehash(len(self.table))
+
+    def __robin_hood_delete(self, key: str) -> None:
+        """
+        Delete the item at a certain key from a robin_hood table, shifting each following item in the cluster
+            back a slot until reaching an empty slot or an item already at its hash position.
+        :complexity: O(K + N) where K is the size of the key and N is the length of the cluster
+        :raises KeyError: when the item doesn't exist
+        """
+        position = self.__robin_hood_probe(key, self.hash(key))
+        following = (position + 1) % len(self.table)
+        while self.table[following] is not None and self.distances[following] > 0:
+            self.table[position] = self.table[following]
+            self.distances[position] = self.distances[following] - 1
+            position = following
+            following = (following + 1) % len(self.table)
+        self.table[position] = None
+        self.distances[position] = None
+        self.count -= 1
+
     def initalise_with_tablesize(self, tablesize: int) -> None:
         """
-        Initialise a new array, with table size given by tablesize.
-        Complexity: O(n), where n is len(tablesize)
+        Resize the table to tablesize, keeping every item.
+        :see: #self.rehash(tablesize: int)
         """
-        self.count = 0
-        self.table = ArrayR(tablesize)
+        self.rehash(tablesize)
+
+    def rehash(self, tablesize: int) -> None:
+        """
+        Initialise a new array, with table size given by tablesize, and move every item into it,
+            leaving any tombstones behind. The statistics are not changed by the move.
+        Complexity: O(n + m) with a good hash function, where n is tablesize and m is the old table size.
+            A compact table being rehashed to the same size reuses its cached hash positions.
+        :raises ValueError: when tablesize is too small to hold every item
+        """
+        if tablesize < self.count:
+            raise ValueError("Cannot rehash {0} items into a table of size {1}.".format(self.count, tablesize))
+        old_table = self.table
+        old_homes, old_values = self.homes, self.values
+        same_size = tablesize == len(old_table)
+        self.table_size = tablesize
+        self.__allocate(tablesize)
+        if self.compact:
+            for old_position in range(len(old_table)):
+                key = old_table[old_position]
+                if key is not None and key is not TOMBSTONE:
+                    home = old_homes[old_position] if same_size else self.hash(key)
+                    position = home
+                    while self.table[position] is not None:
+                        position = (position + 1) % tablesize
+                    self.table[position] = key
+                    self.homes[position] = home
+                    self.values[position] = old_values[old_position]
+            self.tombstones = 0
+            self.resize_count += 1
+            return
+        if self.robin_hood:
+            self.distances = ArrayR(tablesize)
+            self.count = 0
+            for item in old_table:
+                if item is not None:
+                    self.__robin_hood_insert(item[0], item[1], self.hash(item[0]), False)
+            self.resize_count += 1
+            return
+        for item in old_table:
+            if item is not None and item is not TOMBSTONE:
+                position = self.hash(item[0])
+                while self.table[position] is not None:  # Items are all different, so just find an empty slot
+                    position = (position + 1) % tablesize
+                self.table[position] = item
+        self.tombstones = 0
+        self.resize_count += 1
 
     def is_empty(self):
         """
@@ -174,14 +707,27 @@ class LinearProbePotionTable(Generic[T]):
         """
         self[key] = data
 
+    def items(self) -> list[tuple[str, T]]:
+        """
+        Returns all the (key, data) pairs in our hash table (no particular order)
+        :complexity: O(N) where N is the table size
+        """
+        if self.compact:
+            return [(key, data) for key, data in zip(self.table, self.values)
+                    if key is not None and key is not TOMBSTONE]
+        return [item for item in self.table if item is not None and item is not TOMBSTONE]
+
     def __str__(self) -> str:
         """
         Returns all they key/value pairs in our hash table (no particular order)
         :complexity: O(N) where N is the table size
         """
         result = ""
-        for item in self.table:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for item in self.items():
+            (key, value) = item
+            result += "(" + str(key) + "," + str(value) + ")\n"
         return result
+
+
+# The hash every table uses unless it is replaced, which hash_many can batch with Potion.hash_many
+DEFAULT_HASH = LinearProbePotionTable.hash
@@ -13,13 +13,20 @@ __docformat__ = 'reStructuredText'
 class ListNode(Generic[T]):
     """ Simple linked node. It contains an item and has a reference to next node. """
 
+    __slots__ = ('item', 'next')
+
     def __init__(self, item: T = None) -> None:
         """ Node initialiser. """
         self.item = item
         self.next = None
 
 class TreeNode(Generic[K, I]):
-    """ Node class represent BST nodes. """
+    """ Node class represent BST nodes.
+        Nodes keep their attributes in __slots__ rather than a __dict__,
+        as trees hold a great many of them.
+    """
+
+    __slots__ = ('key', 'item', 'left', 'right')
 
     def __init__(self, key: K, item: I = None) -> None:
         """
@@ -43,9 +50,12 @@ class TreeNode(Generic[K, I]):
 
 class AVLTreeNode(TreeNode, Generic[K, I]):
     """ Node class for AVL trees.
-        Objects of this class have an additional variable - height.
+        Objects of this class have two additional variables - height, and
+        size, the number of nodes in the sub-tree of the node.
     """
 
+    __slots__ = ('height', 'size')
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -55,4 +65,23 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
 
         super(AVLTreeNode, self).__init__(key, item)
         self.height = 1
-        self.right_nodes = 1
+        self.size = 1
+
+class ProfitTreeNode(AVLTreeNode, Generic[K, I]):
+    """ Node class for profit trees.
+        Objects of this class also keep the total spend and total profit of
+        every potion in their sub-tree.
+    """
+
+    __slots__ = ('spend', 'profit')
+
+    def __init__(self, key: K, item: I = None) -> None:
+        """
+            Initialises the node with a key and an item of
+            [amount_purchasable, profit_factor, name]
+            :complexity: O(1)
+        """
+
+        super(ProfitTreeNode, self).__init__(key, item)
+        self.spend = item[0]
+        self.profit = item[0] * item[1]
@@ -4,8 +4,14 @@ Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
 This file allows us to create potion objects, to later use in game.py
 """
 
+from __future__ import annotations
+
 from primes import largest_prime
 
+# good_hash constants, found once when this file is imported rather than on every hash
+GOOD_HASH_BASE = largest_prime(10000)
+GOOD_HASH_MULTIPLIER = largest_prime(8000)
+
 
 class Potion:
     """
@@ -16,8 +22,12 @@ class Potion:
         name: Name of potion
         buy_price: Buy price of potion
         quantity: Quantity of potion object will hold
+
+    The attributes are kept in __slots__ rather than a __dict__, as a game can hold millions of potions.
     """
-    
+
+    __slots__ = ('potion_type', 'name', 'buy_price', 'quantity')
+
     def __init__(self, potion_type: str, name: str, buy_price: float, quantity: float) -> None:
         self.potion_type = potion_type
         self.name = name
@@ -45,19 +55,40 @@ class Potion:
         Time Complexity (Best and worst): O(potion_name)
         """
         value = 0
-        a = largest_prime(10000)
-        b = largest_prime(8000)
-        for i in range(len(potion_name)):
-            value = (ord(potion_name[i]) + a * value) % tablesize
+        a = GOOD_HASH_BASE
+        b = GOOD_HASH_MULTIPLIER
+        for char in potion_name:
+            value = (ord(char) + a * value) % tablesize
             a = (a * b) % (tablesize - 1)
         return value
 
+    @classmethod
+    def hash_many(cls, potion_names: list[str], tablesize: int) -> list[int]:
+        """
+        This method gives the good_hash of every name in potion_names for the same tablesize, in the same order.
+
+        Time Complexity (Best and worst): O(total length of potion_names)
+        """
+        b = GOOD_HASH_MULTIPLIER
+        modulus = tablesize - 1
+        hashes = []
+        for potion_name in potion_names:
+            value = 0
+            a = GOOD_HASH_BASE
+            for char in potion_name:
+                value = (ord(char) + a * value) % tablesize
+                a = (a * b) % modulus
+            hashes.append(value)
+        return hashes
+
     @classmethod
     def bad_hash(cls, potion_name: str, tablesize: int) -> int:
         """
         This method hashes a value, given a key to hash the value for, and a tablesize.
 
         This function does a poor job of producing unique hash values for each given key for the tablesize.
+        The sum is reduced modulo tablesize at the end, as a long name could otherwise give a position past the end
+            of the table.
 
         Time complexity (Best and worst): O(potion_name)
         """
@@ -65,4 +96,4 @@ class Potion:
 
         for i in range(len(potion_name)):
             value += (ord(potion_name[i])*i) % tablesize
-        return value
+        return value % tablesize  # The sum can pass tablesize, and must still be a valid position
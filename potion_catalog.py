@@ -0,0 +1,160 @@
+"""
+Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
+
+This file gives a columnar catalog of every potion in the game. Each potion name is given an integer id, and the
+buy price, quantity and type of every potion are kept in typed arrays indexed by id, so that pricing a batch of
+potions reads contiguous columns instead of a Potion object per potion.
+"""
+
+from __future__ import annotations
+# ^ In case you aren't on Python 3.10
+from array import array
+
+from hash_table import LinearProbePotionTable
+from potion import Potion
+
+
+class PotionCatalog:
+    """
+    Potion Catalog
+
+    attributes:
+        ids: a LinearProbePotionTable, with compact storage, from each potion name to its id
+        names: names[i] is the name of the potion with id i
+        potion_types: every potion type, in the order they were first seen
+        type_index: the index in potion_types of every potion type
+        type_ids: type_ids[i] is the index in potion_types of the type of the potion with id i
+        buy_prices: buy_prices[i] is the price the vendors buy the potion with id i for
+        quantities: quantities[i] is the litres of the potion with id i in the vendor inventory
+    """
+
+    def __init__(self, max_potions: int = 1, good_hash: bool = True) -> None:
+        """
+        Initialisation of an empty catalog, sized for max_potions potions before its hash table has to grow.
+
+        Complexity: O(max_potions)
+        """
+        self.ids = LinearProbePotionTable(max(max_potions, 1), good_hash, -1, 0.75, False, True)  # Compact storage
+        self.names = []
+        self.potion_types = []
+        self.type_index = {}
+        self.type_ids = array('i')
+        self.buy_prices = array('d')
+        self.quantities = array('d')
+
+    @classmethod
+    def from_potion_data(cls, potion_data: list) -> PotionCatalog:
+        """
+        Creates a catalog of every (name, potion_type, buy_price) in potion_data, each with 0 litres.
+
+        Complexity: O(N), where N is length potion_data
+        """
+        catalog = cls(len(potion_data))
+        catalog.add_many(potion_data)
+        return catalog
+
+    @property
+    def good_hash(self) -> bool:
+        return self.ids.good_hash
+
+    @property
+    def table_size(self) -> int:
+        return self.ids.table_size
+
+    def __len__(self) -> int:
+        """
+        Returns the number of potions in the catalog
+        :complexity: O(1)
+        """
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Checks to see if the potion called name is in the catalog
+        :complexity: O(K) with a good hash function, where K is the size of the name
+        """
+        return name in self.ids
+
+    def add_many(self, potion_data: list, quantities: list = None) -> list[int]:
+        """
+        Adds every (name, potion_type, buy_price) in potion_data, with the matching litres in quantities or else 0
+            litres, and returns their ids in the same order. A name already in the catalog keeps its id, and has its
+            type, price and litres replaced.
+
+        Complexity: O(N) with a good hash function, where N is length potion_data
+        """
+        already_added = len(self.names) > 0
+        batch_ids = {}
+        new_pairs = []
+        potion_ids = []
+        for i, (name, potion_type, buy_price) in enumerate(potion_data):
+            type_id = self.type_index.get(potion_type)
+            if type_id is None:
+                type_id = self.type_index[potion_type] = len(self.potion_types)
+                self.potion_types.append(potion_type)
+            litres = 0 if quantities is None else quantities[i]
+
+            potion_id = batch_ids.get(name)
+            if potion_id is None and already_added and name in self.ids:
+                potion_id = self.ids[name]
+            if potion_id is None:  # A new potion goes on the end of every column
+                potion_id = len(self.names)
+                self.names.append(name)
+                self.type_ids.append(type_id)
+                self.buy_prices.append(buy_price)
+                self.quantities.append(litres)
+                new_pairs.append((name, potion_id))
+            else:
+                self.type_ids[potion_id] = type_id
+                self.buy_prices[potion_id] = buy_price
+                self.quantities[potion_id] = litres
+            batch_ids[name] = potion_id
+            potion_ids.append(potion_id)
+        self.ids.set_many(new_pairs)
+        return potion_ids
+
+    def id_of(self, name: str) -> int:
+        """
+        Returns the id of the potion called name
+        :complexity: O(K) with a good hash function, where K is the size of the name
+        :raises KeyError: when the potion doesn't exist
+        """
+        return self.ids[name]
+
+    def ids_of(self, names: list[str]) -> list[int]:
+        """
+        Returns the id of the potion called each name in names, in the same order
+        :see: #LinearProbePotionTable.get_many(keys: list[str])
+        """
+        return self.ids.get_many(names)
+
+    def name_of(self, potion_id: int) -> str:
+        """
+        Returns the name of the potion with this id
+        :complexity: O(1)
+        """
+        return self.names[potion_id]
+
+    def potion(self, potion_id: int) -> Potion:
+        """
+        Returns a Potion holding the details of the potion with this id. It is a copy, so changing it does not change
+            the catalog.
+        :complexity: O(1)
+        """
+        return Potion(self.potion_types[self.type_ids[potion_id]], self.name_of(potion_id), self.buy_prices[potion_id],
+                      self.quantities[potion_id])
+
+    def __getitem__(self, name: str) -> Potion:
+        """
+        Returns a Potion holding the details of the potion called name
+        :see: #self.potion(potion_id: int)
+        :raises KeyError: when the potion doesn't exist
+        """
+        return self.potion(self.id_of(name))
+
+    def items(self) -> list[tuple[str, Potion]]:
+        """
+        Returns the (name, potion) pair of every potion, in order of id
+        :complexity: O(N) where N is the number of potions
+        """
+        return [(self.name_of(potion_id), self.potion(potion_id)) for potion_id in range(len(self))]
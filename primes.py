@@ -3,30 +3,172 @@ Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
 
 This file gives a function of a prime number generator, allowing us to call it from other files.
 
+The small primes are kept in a PrimeTable, which is sieved once, so largest_prime and next_prime are binary searches of
+the table. A prime past the end of the table is found by sieving a small window of numbers next to it with a segmented
+sieve, which only needs the table to reach the square root of the window, so primes in the millions stay cheap.
 """
 
-def largest_prime(k: int) -> int:
+from __future__ import annotations
+# ^ In case you aren't on Python 3.10
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from math import isqrt
+
+# How many numbers the segmented sieve crosses off at a time
+SEGMENT_SIZE = 1 << 18
+# How many numbers next to k are sieved at a time, to find a prime near k past the end of a PrimeTable
+WINDOW_SIZE = 1 << 11
+
+
+def sieve(k: int) -> bytearray:
+    """
+    Start off with a bytearray of length k, filled with 1. Then cross out every multiple of each prime p, from p*p,
+        by setting a whole slice of the bytearray to 0 at once.
+
+    Input K: Integer
+    Output: A bytearray where index i is 1 if i is prime, and 0 otherwise, for 0 <= i < k.
+
+    Time Complexity (Best and worst): O(k * log(log(k)))
+
+    """
+    flags = bytearray([1]) * max(k, 0)
+    flags[:2] = bytes(min(max(k, 0), 2))  # 0 and 1 are not prime
+    p = 2
+    while p * p < k:
+        if flags[p]:
+            flags[p * p::p] = bytes(len(range(p * p, k, p)))
+        p += 1
+    return flags
+
+
+def segmented_sieve(low: int, high: int, base_primes=None) -> list[int]:
+    """
+    Finds every prime p with low <= p < high, sieving SEGMENT_SIZE numbers at a time, so memory does not grow with
+        high. base_primes must hold every prime up to sqrt(high) in order, and more are allowed. They are sieved
+        when not given.
+
+    Time Complexity (Best and worst): O(sqrt(high) + (high - low) * log(log(high)))
+
+    """
+    low = max(low, 2)
+    if high <= low:
+        return []
+    if base_primes is None:
+        base_primes = list(compress(range(isqrt(high - 1) + 1), sieve(isqrt(high - 1) + 1)))
+    result = []
+    for start in range(low, high, SEGMENT_SIZE):
+        end = min(start + SEGMENT_SIZE, high)
+        flags = bytearray([1]) * (end - start)  # flags[i] is whether start + i is prime
+        for p in base_primes:
+            if p * p >= end:
+                break
+            first = max(p * p, (start + p - 1) // p * p)  # The first multiple of p in this segment worth crossing out
+            flags[first - start::p] = bytes(len(range(first - start, end - start, p)))
+        result.extend(compress(range(start, end), flags))
+    return result
+
+
+class PrimeTable:
+    """
+    Prime Table
+
+    attributes:
+        primes: every prime below limit, in order
+        limit: the table has been sieved up to here
     """
-    Start off with list of len(k), filled with True. Then turn each True
-    to False when it is determined by the algorithm that they are not prime.
-    Finally, find the index of the last True element in the list, by
-    iterating backwards.
 
+    def __init__(self, limit: int = 1 << 16) -> None:
+        """
+        Sieves every prime below limit. A limit below 2 is raised to 2, as extend needs the table to cover at least
+            0 and 1.
+
+        Complexity: O(limit * log(log(limit)))
+        """
+        limit = max(limit, 2)
+        self.primes = array('q', compress(range(limit), sieve(limit)))
+        self.limit = limit
+
+    def extend(self, limit: int) -> None:
+        """
+        Makes sure every prime below limit is in the table. The table at least doubles each time it is extended, so
+            asking for slightly larger primes over and over does not sieve over and over.
+
+        Complexity: O(1) if limit is already covered, otherwise O(L * log(log(L))) where L is the new limit
+        """
+        if limit <= self.limit:
+            return
+        limit = max(limit, 2 * self.limit)
+        if isqrt(limit - 1) >= self.limit:  # The segmented sieve needs every prime up to sqrt(limit) first
+            self.extend(isqrt(limit - 1) + 1)
+        self.primes.extend(segmented_sieve(self.limit, limit, self.primes))
+        self.limit = limit
+
+    def largest_prime(self, k: int) -> int:
+        """
+        Returns the largest prime smaller than k. Below the limit of the table this is a binary search, and above it
+            the numbers just below k are sieved a window at a time, with the table only extended to sqrt(k).
+
+        Complexity: O(log(P)) for k within the table, where P is the number of primes in the table, otherwise
+            O(sqrt(k) / log(k)) per window, as prime gaps mean one window is almost always enough
+        :raises ValueError: when there is no prime smaller than k
+        """
+        while k > self.limit:
+            low = max(k - WINDOW_SIZE, self.limit)
+            self.extend(isqrt(k - 1) + 1)
+            found = segmented_sieve(low, k, self.primes)
+            if found:
+                return found[-1]
+            k = low
+        index = bisect_left(self.primes, k)
+        if index == 0:
+            raise ValueError("There is no prime smaller than {0}.".format(k))
+        return self.primes[index - 1]
+
+    def next_prime(self, k: int) -> int:
+        """
+        Returns the smallest prime bigger than or equal to k. Within the table this is a binary search, and past it
+            the numbers from k upwards are sieved a window at a time, with the table only extended to sqrt of the
+            window.
+
+        Complexity: O(log(P)) for k within the table, where P is the number of primes in the table, otherwise
+            O(sqrt(k) / log(k)) per window, as prime gaps mean one window is almost always enough
+        """
+        index = bisect_left(self.primes, k)
+        if index < len(self.primes):
+            return self.primes[index]
+        low = max(k, self.limit)  # Every prime in the table is smaller than k
+        while True:
+            high = low + WINDOW_SIZE
+            self.extend(isqrt(high - 1) + 1)
+            found = segmented_sieve(low, high, self.primes)
+            if found:
+                return found[0]
+            low = high
+
+
+# The table shared by largest_prime and next_prime, extended as larger primes are asked for
+_table = PrimeTable()
+
+
+def largest_prime(k: int) -> int:
+    """
     Input K: Integer
     Output: Closest prime number smaller than k.
 
-    Time Complexity (Best and worst): O(n) where n is input k
+    Time Complexity: O(log(k)) for k within the table, otherwise O(sqrt(k) / log(k))
 
+    :raises ValueError: when there is no prime smaller than k
     """
-    assert 0 < k < 100000
-    prime = [i for i in range(0, k)]    # Create a list of all values from 0 to k
-    p = 2   # Start while loop from 2
-    while p * p <= k - 1:   # Keep running loop until p*p is is bigger than or equal to k
-        if prime[p]:
-            for i in range(p ** 2, k, p):  # Set all multiples of p to False up to k
-                prime[i] = False
-        p += 1  # Increment p
+    return _table.largest_prime(k)
 
-    # Finding and returning the last element in prime list that is not False
-    return list(filter(None, prime))[-1]
 
+def next_prime(k: int) -> int:
+    """
+    Input K: Integer
+    Output: Smallest prime number bigger than or equal to k.
+
+    Time Complexity: O(log(k)) for k within the table, otherwise O(sqrt(k) / log(k))
+
+    """
+    return _table.next_prime(k)
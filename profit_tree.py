@@ -0,0 +1,95 @@
+""" AVL Tree of profitable potions that keeps running spend and profit totals. """
+
+__author__ = 'Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh'
+__docformat__ = 'reStructuredText'
+
+from avl import AVLTree
+from typing import TypeVar, Generic
+from node import ProfitTreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class ProfitTree(AVLTree, Generic[K, I]):
+    """ AVL tree keyed by (profit_factor, name), holding items of
+        [amount_purchasable, profit_factor, name].
+
+        Every node knows the total spend and total profit of its sub-tree,
+        so the money made on a day can be found with one walk from the root
+        instead of going through the potions one by one.
+    """
+
+    update_whole_path = True  # Every node above a change has new totals
+
+    def create_node(self, key: K, item: I) -> ProfitTreeNode:
+        """
+            Create a new node holding the spend and profit of item.
+            :complexity: O(1)
+        """
+
+        return ProfitTreeNode(key, item)
+
+    def get_spend(self, current: ProfitTreeNode) -> float:
+        """
+            Total spend of the sub-tree of current, 0 if current is None.
+            :complexity: O(1)
+        """
+
+        if current is not None:
+            return current.spend
+        return 0
+
+    def get_profit(self, current: ProfitTreeNode) -> float:
+        """
+            Total profit of the sub-tree of current, 0 if current is None.
+            :complexity: O(1)
+        """
+
+        if current is not None:
+            return current.profit
+        return 0
+
+    def update_node(self, current: ProfitTreeNode) -> None:
+        """
+            Recompute the height, spend and profit of current from its
+            children.
+            :complexity: O(1)
+        """
+
+        AVLTree.update_node(self, current)
+        amount_purchasable, profit_factor = current.item[0], current.item[1]
+        current.spend = self.get_spend(current.left) + amount_purchasable + self.get_spend(current.right)
+        current.profit = (self.get_profit(current.left) + amount_purchasable * profit_factor
+                          + self.get_profit(current.right))
+
+    def profit_for_money(self, money_for_day: float) -> float:
+        """
+            Returns the money made by buying the most profitable potions first
+            with money_for_day, and selling everything bought.
+
+            Whole sub-trees of more profitable potions that can be afforded
+            are bought at once, so only one path from the root is walked.
+
+            Complexity: Worst O(log(n)), best O(1) where n is the amount of nodes on ProfitTree
+        """
+        profit_for_day = 0
+        current = self.root
+        while current is not None:
+            if current.right is not None and current.right.spend > money_for_day:
+                current = current.right  # Can't afford all of the more profitable potions, so look among them
+                continue
+
+            # Buy every potion more profitable than this one
+            money_for_day -= self.get_spend(current.right)
+            profit_for_day += self.get_profit(current.right)
+
+            amount_purchasable, profit_factor = current.item[0], current.item[1]
+            if amount_purchasable > money_for_day:  # If there is more than I'm able to purchase
+                if money_for_day != 0:
+                    profit_for_day += money_for_day * profit_factor
+                return profit_for_day
+            money_for_day -= amount_purchasable
+            profit_for_day += amount_purchasable * profit_factor
+            current = current.left
+        return profit_for_day
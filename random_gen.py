@@ -3,10 +3,30 @@ Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
 
 This file allows us to generate random numbers between 0 and k using the RandomGen class. It has a helper function outside of the class called lcg.
 
+Each random number is the bitwise majority vote of the top 16 bits of five lcg outputs. The vote is done on all 16 bits
+at once with integer bitwise operations, and RandomGen.randints can make a whole batch of random numbers at once,
+with NumPy when it is installed.
+
+A step of the lcg is the affine map x -> (a * x + c) mod 2^32, and n steps are another affine map, found in O(log(n))
+by repeated squaring with affine_power. RandomGen.advance uses this to skip ahead, and RandomGen.split to deal the
+random numbers out to several independent streams.
 """
 
+from __future__ import annotations
+# ^ In case you aren't on Python 3.10
 from typing import Generator
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, randints works without it
+    np = None
+
+# The lcg RandomGen uses
+MODULUS = pow(2, 32)
+MULTIPLIER = 134775813
+INCREMENT = 1
+MASK = MODULUS - 1
+
 
 def lcg(modulus: int, a: int, c: int, seed: int) -> Generator[int, None, None]:
     """Linear congruential generator."""
@@ -15,6 +35,47 @@ def lcg(modulus: int, a: int, c: int, seed: int) -> Generator[int, None, None]:
         yield seed
 
 
+def compose(first: tuple[int, int], second: tuple[int, int]) -> tuple[int, int]:
+    """
+    This function returns the affine map (multiplier, increment) modulo 2^32 that applies first and then second.
+
+    Complexity: O(1)
+    """
+    return (second[0] * first[0]) & MASK, (second[0] * first[1] + second[1]) & MASK
+
+
+def affine_power(step: tuple[int, int], n: int) -> tuple[int, int]:
+    """
+    This function returns the affine map (multiplier, increment) modulo 2^32 that applies step n times, by repeated
+        squaring. affine_power((MULTIPLIER, INCREMENT), n) jumps the lcg n outputs ahead.
+
+    Complexity: O(log(n))
+    """
+    result = (1, 0)
+    while n > 0:
+        if n & 1:
+            result = compose(result, step)
+        step = compose(step, step)
+        n >>= 1
+    return result
+
+
+# The lcg RandomGen uses, and the five steps of it each random number takes
+LCG_STEP = (MULTIPLIER, INCREMENT)
+FIVE_STEPS = affine_power(LCG_STEP, 5)
+
+
+def majority(a: int, b: int, c: int, d: int, e: int) -> int:
+    """
+    This function returns the bitwise majority vote of five integers, which has a 1 in every bit position where at
+        least three of them have a 1. It works on NumPy integer arrays as well, bit by bit in every element.
+
+    Complexity: O(1)
+    """
+    at_least_two_of_abc = (a & b) | (c & (a | b))
+    return (a & b & c) | (at_least_two_of_abc & (d | e)) | ((a | b | c) & d & e)
+
+
 def check_nums(lst: list, index: int) -> bool:
     """
     This function returns a boolean expression that tells us if in list of objects, at least three of the objects have a 1, in index position 'index'.
@@ -35,15 +96,31 @@ class RandomGen:
     This class allows us to generate random numbers that will change every time called in the same runtime.
 
     seed: the seed will be used by lcg function above
+    state: the last output of the lcg, or the seed before the first one
     rand_numb_iter: This is an iterator that will provide us with unique random numbers each time it is called
+    skip: None, or the affine map applied to state after every random number, to skip past the numbers that belong
+        to the other streams made by split
+    numpy_threshold: randints uses NumPy when it is installed and at least this many numbers are asked for
     """
 
+    numpy_threshold = 256
+
     def __init__(self, seed: int = 0) -> None:
         """
         Initialisation
         """
         self.seed = seed
-        self.rand_numb_iter = lcg(pow(2, 32), 134775813, 1, self.seed)
+        self.state = seed
+        self.skip = None
+        self.rand_numb_iter = self.__lcg()
+
+    def __lcg(self) -> Generator[int, None, None]:
+        """
+        The lcg function above, stepping self.state so that it is shared with randint and randints.
+        """
+        while True:
+            self.state = (MULTIPLIER * self.state + INCREMENT) % MODULUS
+            yield self.state
 
     def randint(self, k: int) -> int:
         """
@@ -57,16 +134,101 @@ class RandomGen:
         Complexity: Best and worst O(1)
 
         """
-        five_ran_nums = ["{:032b}".format((self.rand_numb_iter.__next__()))[:16] for i in
-                         range(5)]  # Get 5 numbers from lcg() and transform them to 32 bit binary
-        output_binary = ""
+        state = self.state
+        # Get 5 numbers from the lcg, keeping the top 16 of their 32 bits
+        state = (MULTIPLIER * state + INCREMENT) & MASK
+        a = state >> 16
+        state = (MULTIPLIER * state + INCREMENT) & MASK
+        b = state >> 16
+        state = (MULTIPLIER * state + INCREMENT) & MASK
+        c = state >> 16
+        state = (MULTIPLIER * state + INCREMENT) & MASK
+        d = state >> 16
+        state = (MULTIPLIER * state + INCREMENT) & MASK
+        e = state >> 16
+        if self.skip is not None:
+            state = (self.skip[0] * state + self.skip[1]) & MASK
+        self.state = state
+        return majority(a, b, c, d, e) % k + 1
+
+    def draw_step(self) -> tuple[int, int]:
+        """
+        This method returns the affine map that each random number moves state by, the five lcg steps and then skip.
 
-        for i in range(16):
-            if check_nums(five_ran_nums, i):
-                output_binary += "1"
-            else:
-                output_binary += "0"
+        Complexity: Best and worst O(1)
+        """
+        return FIVE_STEPS if self.skip is None else compose(FIVE_STEPS, self.skip)
+
+    def advance(self, n: int) -> None:
+        """
+        This method skips the next n random numbers, as if randint had been called n times.
+
+        Complexity: Best and worst O(log(n))
+        """
+        multiplier, increment = affine_power(self.draw_step(), n)
+        self.state = (multiplier * self.state + increment) & MASK
 
-        return int(output_binary, 2) % k + 1
+    def split(self, k: int) -> list[RandomGen]:
+        """
+        This method returns k independent streams of the random numbers this generator would give next. Stream i
+            gives the i'th of them, then the (i + k)'th, then the (i + 2k)'th and so on, so taking turns to draw from
+            each stream in order gives exactly the same numbers as drawing from this generator. This generator is not
+            changed.
+
+        Complexity: Best and worst O(k + log(k))
+        """
+        if k < 1:
+            raise ValueError("Cannot split into {0} streams.".format(k))
+        draw_step = self.draw_step()
+        # After each number a stream skips over the k - 1 numbers of the other streams
+        skip = affine_power(draw_step, k - 1)
+        if self.skip is not None:
+            skip = compose(self.skip, skip)
+        streams = []
+        state = self.state
+        for _ in range(k):
+            stream = RandomGen(self.seed)
+            stream.state = state
+            stream.skip = skip
+            stream.numpy_threshold = self.numpy_threshold
+            streams.append(stream)
+            state = (draw_step[0] * state + draw_step[1]) & MASK
+        return streams
+
+    def randints(self, k: int, n: int) -> list[int]:
+        """
+        This method returns a list of n random numbers between 0 and k, the same numbers as calling randint(k) n times
+
+        Complexity: Best and worst O(n)
+        :raises ZeroDivisionError: when k is 0, as randint does, before the generator is moved on
+        """
+        if k == 0:
+            raise ZeroDivisionError("integer modulo by zero")
+        if np is not None and 0 < k and 0 < n and self.numpy_threshold <= n:  # Negative k is left to randint
+            return self.__numpy_randints(k, n)
+        return [self.randint(k) for _ in range(n)]
+
+    def __numpy_randints(self, k: int, n: int) -> list[int]:
+        """
+        This method gives the same numbers as randints, with NumPy. If each number moves state by the affine map
+            x -> A * x + C, then the state before the j'th number is A^j * state + (A^(j - 1) + ... + A + 1) * C, so the
+            state before every number is found at once from cumulative products and sums of powers of A. These are
+            exact modulo 2^64, and so modulo 2^32. The five lcg outputs of every number are then found together.
+
+        Complexity: Best and worst O(n)
+        """
+        multiplier, increment = self.draw_step()
+        powers = np.ones(n, dtype=np.uint64)
+        powers[1:] = np.cumprod(np.full(n - 1, multiplier, dtype=np.uint64))  # A^0 ... A^(n - 1)
+        sums = np.cumsum(powers) - powers  # A^0 + ... + A^(j - 1) for j = 0 ... n - 1
+        mask = np.uint64(MASK)
+        state = (powers * np.uint64(self.state % MODULUS) + sums * np.uint64(increment)) & mask
+        self.advance(n)
+
+        top_bits = []
+        for _ in range(5):
+            state = (np.uint64(MULTIPLIER) * state + np.uint64(INCREMENT)) & mask
+            top_bits.append(state >> np.uint64(16))
+        return (majority(*top_bits) % np.uint64(k) + np.uint64(1)).tolist()
 
 
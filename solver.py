@@ -0,0 +1,346 @@
+"""
+Author: Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh
+
+This file allows us to answer every day of the potion seller game quickly, once the profitable potions have been
+ranked from most to least profitable.
+
+It has a class ProfitSolver, which builds cumulative spend and profit arrays over the ranked potions once, and then
+answers each day's starting money with a binary search and a single partial purchase.
+
+If NumPy is installed, NumpyProfitSolver does the same work as ProfitSolver with vectorised operations, which is
+much faster for large batches.
+
+It also has a class IncrementalProfitSolver, which keeps the ranked potions between calls so that a few changed
+valuations can be applied without ranking every potion again.
+"""
+
+from __future__ import annotations
+# ^ In case you aren't on Python 3.10
+from bisect import bisect_right
+from itertools import islice
+from typing import Iterable, Iterator
+
+from profit_tree import ProfitTree
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python solvers are used without it
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+class ProfitSolver:
+    """
+    Profit Solver
+
+    attributes:
+        spend: spend[j] is the money needed to buy every litre of the j most profitable potions, spend[0] == 0
+        profit: profit[j] is the money made by selling every litre of the j most profitable potions, profit[0] == 0
+        factors: factors[j] is the profit factor of the (j + 1)'th most profitable potion
+    """
+
+    def __init__(self, sorted_list_of_potions: list) -> None:
+        """
+        Builds the cumulative arrays from a list of [amount_purchasable, profit_factor, key] entries, sorted from most
+            to least profitable.
+
+        Complexity: O(N), where N is length of sorted_list_of_potions
+        """
+        self.spend = [0]
+        self.profit = [0]
+        self.factors = []
+        spend_total = 0
+        profit_total = 0
+        for amount_purchasable, profit_factor, _ in sorted_list_of_potions:
+            spend_total += amount_purchasable
+            profit_total += amount_purchasable * profit_factor  # Same order of additions as buying one by one
+            self.spend.append(spend_total)
+            self.profit.append(profit_total)
+            self.factors.append(profit_factor)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of ranked potions
+        :complexity: O(1)
+        """
+        return len(self.factors)
+
+    def _finish_day(self, money_for_day: float, bought: int) -> float:
+        """
+        Given that the first 'bought' potions can be bought outright, spend whatever money is left on the next potion.
+
+        Complexity: O(1)
+        """
+        profit_for_day = self.profit[bought]
+        money_left = money_for_day - self.spend[bought]
+        if bought < len(self.factors) and money_left != 0:
+            profit_for_day += money_left * self.factors[bought]  # Partially buy the next most profitable potion
+        return profit_for_day
+
+    def solve_day(self, money_for_day: float) -> float:
+        """
+        Returns the money made on a single day, starting with money_for_day.
+
+        Complexity: O(log(N)), where N is the number of ranked potions
+        """
+        bought = max(bisect_right(self.spend, money_for_day) - 1, 0)  # Potions we can afford to buy all of
+        return self._finish_day(money_for_day, bought)
+
+    def solve(self, starting_money: list) -> list[float]:
+        """
+        Returns the money made on each day, indexed by day.
+
+        Complexity: O(M*log(N)), where M is length of starting_money and N is the number of ranked potions
+        """
+        return [self.solve_day(money_for_day) for money_for_day in starting_money]
+
+    def solve_sorted(self, starting_money: list) -> list[float]:
+        """
+        Returns the money made on each day, indexed by day, for days given in non-decreasing order of starting money.
+            The days and the cumulative spend array are walked together in a single merge pass.
+
+        Complexity: O(M + N), where M is length of starting_money and N is the number of ranked potions
+        :raises ValueError: when starting_money is not sorted
+        """
+        profit_output = []
+        bought = 0
+        last_money = None
+        for money_for_day in starting_money:
+            if last_money is not None and money_for_day < last_money:
+                raise ValueError("starting_money must be sorted to use solve_sorted.")
+            last_money = money_for_day
+            while bought < len(self.factors) and self.spend[bought + 1] <= money_for_day:
+                bought += 1
+            profit_output.append(self._finish_day(money_for_day, bought))
+        return profit_output
+
+
+class NumpyProfitSolver:
+    """
+    NumPy Profit Solver
+
+    This does the same as ranking the potions with Game.rank_profitable_potions and answering the days with
+        ProfitSolver, but with the profitability filter, profit factors, ranking and every day done as NumPy array
+        operations. Only available when NumPy is installed.
+
+    attributes:
+        spend: spend[j] is the money needed to buy every litre of the j most profitable potions, spend[0] == 0
+        profit: profit[j] is the money made by selling every litre of the j most profitable potions, profit[0] == 0
+        factors: factors[j] is the profit factor of the (j + 1)'th most profitable potion
+    """
+
+    def __init__(self, sell_prices_vendor: list, quantities: list, adventurer_buy_prices: list, keys: list) -> None:
+        """
+        Ranks the potions and builds the cumulative arrays. The i'th entry of each argument describes the same
+            potion: the price PotionCorp sells it for, the litres PotionCorp has, the price adventurers will pay,
+            and its name.
+
+        Complexity: O(N*log(N)), where N is the number of potions
+        :raises ImportError: when NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("NumPy is needed to use NumpyProfitSolver.")
+        sell_price_vendor = np.asarray(sell_prices_vendor, dtype=float)
+        quantity = np.asarray(quantities, dtype=float)
+        adventurer_buy_price = np.asarray(adventurer_buy_prices, dtype=float)
+
+        # Keep only the profitable potions
+        profitable = sell_price_vendor < adventurer_buy_price
+        sell_price_vendor = sell_price_vendor[profitable]
+        quantity = quantity[profitable]
+        adventurer_buy_price = adventurer_buy_price[profitable]
+        names = np.asarray(keys, dtype=str)[profitable]
+
+        # Rank by (profit_factor, key) from largest to smallest, as Game.rank_profitable_potions does
+        factors = adventurer_buy_price / sell_price_vendor
+        order = np.lexsort((names, factors))[::-1]
+        self.factors = factors[order]
+        amounts = (quantity * sell_price_vendor)[order]
+
+        # cumsum adds in order, so these match the sums ProfitSolver makes
+        self.spend = np.concatenate(([0.0], np.cumsum(amounts)))
+        self.profit = np.concatenate(([0.0], np.cumsum(amounts * self.factors)))
+
+    @classmethod
+    def from_columns(cls, buy_prices, quantities, potion_ids: list, adventurer_buy_prices: list,
+                     keys: list) -> NumpyProfitSolver:
+        """
+        Creates the solver for the potions with the given ids, gathering the price PotionCorp sells each of them for
+            and the litres PotionCorp has from the buy_prices and quantities columns of a PotionCatalog, without
+            copying the columns.
+
+        Complexity: O(N*log(N)), where N is length of potion_ids
+        :raises ImportError: when NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("NumPy is needed to use NumpyProfitSolver.")
+        potion_ids = np.asarray(potion_ids, dtype=np.intp)
+        return cls(np.asarray(buy_prices, dtype=float)[potion_ids], np.asarray(quantities, dtype=float)[potion_ids],
+                   adventurer_buy_prices, keys)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of ranked potions
+        :complexity: O(1)
+        """
+        return len(self.factors)
+
+    def solve(self, starting_money: list) -> list[float]:
+        """
+        Returns the money made on each day, indexed by day. Every day is answered at once with a searchsorted over
+            the cumulative spend.
+
+        Complexity: O(M*log(N)), where M is length of starting_money and N is the number of ranked potions
+        """
+        money_for_day = np.asarray(starting_money, dtype=float)
+        bought = np.maximum(np.searchsorted(self.spend, money_for_day, side='right') - 1, 0)
+        profit_for_day = self.profit[bought]
+        if len(self.factors) > 0:
+            # Partially buy the next most profitable potion with whatever money is left
+            money_left = money_for_day - self.spend[bought]
+            next_factor = self.factors[np.minimum(bought, len(self.factors) - 1)]
+            profit_for_day = profit_for_day + np.where(bought < len(self.factors), money_left * next_factor, 0.0)
+        return profit_for_day.tolist()
+
+    def solve_sorted(self, starting_money: list) -> list[float]:
+        """
+        Returns the money made on each day, indexed by day, for days given in non-decreasing order of starting money,
+            checking the order as ProfitSolver.solve_sorted does. The searchsorted in solve needs no sorting, so the
+            days are then answered by solve.
+
+        Complexity: O(M*log(N)), where M is length of starting_money and N is the number of ranked potions
+        :raises ValueError: when starting_money is not sorted
+        """
+        if np.any(np.diff(np.asarray(starting_money, dtype=float)) < 0):
+            raise ValueError("starting_money must be sorted to use solve_sorted.")
+        return self.solve(starting_money)
+
+
+def solve_in_chunks(solver, starting_money: Iterable[float], chunk_size: int = 4096) -> Iterator[float]:
+    """
+    Reads starting_money chunk_size days at a time, and returns an iterator over the money made on each day using
+        solver.solve, which can be any of the solvers in this file. Only one chunk of days is held at once.
+        chunk_size is checked straight away, rather than when the first day is asked for.
+
+    Complexity: O(M*log(N)), where M is the number of days and N is the number of ranked potions
+    :raises ValueError: when chunk_size is less than 1
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    return _solve_chunks(solver, starting_money, chunk_size)
+
+
+def _solve_chunks(solver, starting_money: Iterable[float], chunk_size: int) -> Iterator[float]:
+    """
+    The generator behind solve_in_chunks, with chunk_size already checked.
+    """
+    days = iter(starting_money)
+    chunk = list(islice(days, chunk_size))
+    while chunk:
+        yield from solver.solve(chunk)
+        chunk = list(islice(days, chunk_size))
+
+
+class IncrementalProfitSolver:
+    """
+    Incremental Profit Solver
+
+    This solver sits on top of a Game, and keeps the profitable potions ranked in a ProfitTree between calls.
+        Changing the valuation of one potion only moves that potion in the tree, and answering days never rebuilds
+        anything.
+
+    attributes:
+        game: The game whose vendor inventory (vendor_company_hash) the potions are bought from
+        profit_tree: The profitable potions, keyed by (profit_factor, name)
+        tree_keys: The key in profit_tree of every profitable potion, by name
+    """
+
+    def __init__(self, game, potion_valuations: list[tuple[str, float]] = ()) -> None:
+        """
+        Initialisation, ranking the given valuations.
+
+        Complexity: O(N*log(N)), where N is length of potion_valuations
+        """
+        self.game = game
+        self.tree_keys = {}
+        records = {}
+        for key, adventurer_buy_price in potion_valuations:  # A later valuation of a potion replaces an earlier one
+            records[key] = self.profit_record(key, adventurer_buy_price)
+        pairs = []
+        for key, record in records.items():
+            if record is not None:
+                self.tree_keys[key] = (record[1], key)
+                pairs.append(((record[1], key), record))
+        self.profit_tree = ProfitTree.from_items(pairs)  # Bulk load the first valuations
+
+    def __len__(self) -> int:
+        """
+        Returns the number of profitable potions
+        :complexity: O(1)
+        """
+        return len(self.profit_tree)
+
+    def profit_record(self, key: str, adventurer_buy_price: float) -> list:
+        """
+        Returns [amount_purchasable, profit_factor, key] for the potion called key, using the vendor price and quantity
+            in the game, or None if it is not profitable.
+
+        Complexity: O(1) with a good hash function
+        """
+        potion_id = self.game.vendor_company_hash[key]
+        sell_price_vendor = self.game.catalog.buy_prices[potion_id]
+        if sell_price_vendor < adventurer_buy_price:  # Only profitable potions are ranked
+            profit_factor = adventurer_buy_price / sell_price_vendor
+            amount_purchasable = self.game.catalog.quantities[potion_id] * sell_price_vendor
+            return [amount_purchasable, profit_factor, key]
+        return None
+
+    def set_valuation(self, key: str, adventurer_buy_price: float) -> None:
+        """
+        Adds or updates how much the adventurers are willing to pay for the potion called key. The vendor price and
+            quantity are read again from the game, so this is also how a change in vendor inventory is picked up.
+
+        Complexity: O(log(N)), where N is the number of profitable potions
+        :raises KeyError: when the potion is not in the vendor inventory, leaving the solver unchanged
+        """
+        record = self.profit_record(key, adventurer_buy_price)  # Can fail, so before the old ranking is removed
+        self.remove_valuation(key)
+        if record is not None:
+            self.profit_tree[record[1], key] = record
+            self.tree_keys[key] = (record[1], key)
+
+    def set_valuations(self, potion_valuations: list[tuple[str, float]]) -> None:
+        """
+        Calls set_valuation for every (name, price) pair in potion_valuations.
+
+        Complexity: O(C*log(N)), where C is length of potion_valuations and N is the number of profitable potions
+        """
+        for key, adventurer_buy_price in potion_valuations:
+            self.set_valuation(key, adventurer_buy_price)
+
+    def remove_valuation(self, key: str) -> None:
+        """
+        Stops considering the potion called key. Does nothing if it is not currently profitable.
+
+        Complexity: O(log(N)), where N is the number of profitable potions
+        """
+        tree_key = self.tree_keys.pop(key, None)
+        if tree_key is not None:
+            del self.profit_tree[tree_key]
+
+    def solve_day(self, money_for_day: float) -> float:
+        """
+        Returns the money made on a single day, starting with money_for_day.
+
+        Complexity: O(log(N)), where N is the number of profitable potions
+        """
+        return self.profit_tree.profit_for_money(money_for_day)
+
+    def solve(self, starting_money: list) -> list[float]:
+        """
+        Returns the money made on each day, indexed by day.
+
+        Complexity: O(M*log(N)), where M is length of starting_money and N is the number of profitable potions
+        """
+        return [self.solve_day(money_for_day) for money_for_day in starting_money]
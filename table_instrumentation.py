@@ -0,0 +1,97 @@
+""" Per-operation instrumentation for the Linear Probe Potion Table.
+
+Records how many probes each lookup and insert took, so it can be seen
+whether long probes come from lookups or inserts, and from a few keys or
+from many.
+"""
+from __future__ import annotations
+
+__author__ = 'Gabriel Tucker, Leon Li, Junchi Wang, Le Nhat Minh'
+__docformat__ = 'reStructuredText'
+
+from threading import Lock
+
+
+class TableInstrumentation:
+    """
+    Table Instrumentation
+
+    attributes:
+        hits: number of lookups that found their key
+        misses: number of lookups that did not find their key
+        inserts: number of sets that added a new key
+        updates: number of sets that replaced the data of a key already in the table
+        histogram: histogram[p] is the number of operations that took p probes
+        worst_offenders: the keys that took the most probes in a single operation, up to max_offenders of them,
+            mapped to the most probes they took
+        max_offenders: how many keys worst_offenders keeps
+    """
+
+    def __init__(self, max_offenders: int = 10) -> None:
+        self.max_offenders = max_offenders
+        self.lock = Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Sets every counter back to zero.
+        :complexity: O(1)
+        """
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.updates = 0
+        self.histogram = []
+        self.worst_offenders = {}
+
+    def record(self, operation: str, key: str, probes: int) -> None:
+        """
+        Records one operation, which is "hit", "miss", "insert" or "update", on key that took probes probes.
+        :complexity: O(1), or O(max_offenders) when key becomes one of the worst offenders
+        """
+        with self.lock:
+            if operation == "hit":
+                self.hits += 1
+            elif operation == "miss":
+                self.misses += 1
+            elif operation == "insert":
+                self.inserts += 1
+            else:
+                self.updates += 1
+
+            while len(self.histogram) <= probes:
+                self.histogram.append(0)
+            self.histogram[probes] += 1
+
+            if probes == 0:
+                return
+            if key in self.worst_offenders:
+                if probes > self.worst_offenders[key]:
+                    self.worst_offenders[key] = probes
+            elif len(self.worst_offenders) < self.max_offenders:
+                self.worst_offenders[key] = probes
+            else:
+                best_key = min(self.worst_offenders, key=self.worst_offenders.get)
+                if probes > self.worst_offenders[best_key]:  # Replace the least bad of the worst offenders
+                    del self.worst_offenders[best_key]
+                    self.worst_offenders[key] = probes
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """
+        Returns a copy of every counter, as a dictionary with the keys "hits", "misses", "inserts", "updates",
+            "histogram" and "worst_offenders", the last as a list of (key, probes) from most probes to least.
+            With reset, the counters are also set back to zero, with no operation recorded in between.
+        :complexity: O(P + max_offenders * log(max_offenders)) where P is the length of the histogram
+        """
+        with self.lock:
+            result = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "inserts": self.inserts,
+                "updates": self.updates,
+                "histogram": list(self.histogram),
+                "worst_offenders": sorted(self.worst_offenders.items(), key=lambda pair: (-pair[1], pair[0])),
+            }
+            if reset:
+                self.clear()
+        return result
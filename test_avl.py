@@ -1,6 +1,10 @@
+import random
 import unittest
 
 from avl import AVLTree
+from linked_stack import Node
+from node import AVLTreeNode, ListNode, ProfitTreeNode, TreeNode
+from profit_tree import ProfitTree
 
 
 class TestAVL(unittest.TestCase):
@@ -49,6 +53,15 @@ class TestAVL(unittest.TestCase):
         self.assertEqual(self.b.root.right.left.item, "B")
         self.assertEqual(self.b.root.left.item, "F")
 
+    def test_slots(self):
+        # Every node class keeps its attributes in __slots__, so no node carries a __dict__
+        item = [1.0, 2.0, "Potion"]
+        for node in (ListNode(item), TreeNode(0, item), AVLTreeNode(0, item), ProfitTreeNode(0, item), Node(item)):
+            self.assertFalse(hasattr(node, '__dict__'), type(node).__name__)
+        tree = ProfitTree()
+        tree[1.5, "Potion"] = item
+        self.assertFalse(hasattr(tree.root, '__dict__'))
+
     def test_kth(self):
         self.b = AVLTree()
         self.b[15] = "A"
@@ -61,6 +74,96 @@ class TestAVL(unittest.TestCase):
         self.b[22] = "H"
         self.assertEqual([self.b.kth_largest(x).key for x in range(1, 9)], [22, 20, 17, 15, 10, 5, 4, 3])
 
+    def test_recursive_matches_iterative(self):
+        iterative = AVLTree()
+        recursive = AVLTree()
+        recursive.iterative = False
+        keys = [(x * 37) % 101 for x in range(101)]
+        for key in keys:
+            iterative[key] = str(key)
+            recursive[key] = str(key)
+        for key in keys[::3]:
+            del iterative[key]
+            del recursive[key]
+        self.assertEqual(list(iterative), list(recursive))
+        self.assertEqual(iterative.root.key, recursive.root.key)
+        self.assertEqual(iterative.root.height, recursive.root.height)
+        with self.assertRaises(ValueError):
+            del iterative[keys[0]]
+        with self.assertRaises(ValueError):
+            iterative[keys[1]] = "duplicate"
+
+    def test_from_items(self):
+        keys = [15, 10, 20, 17, 5, 3, 4, 22, 1, 30, 25]
+        self.b = AVLTree.from_items([(key, str(key)) for key in keys])
+        self.assertEqual(len(self.b), len(keys))
+        self.assertEqual(list(self.b), sorted(keys))
+        self.assertEqual(self.b.root.key, 15)
+        self.assertEqual(self.b.root.height, 4)
+        self.assertEqual([self.b.kth_largest(x).key for x in range(1, len(keys) + 1)], sorted(keys, reverse=True))
+        # The tree keeps working as an AVL tree afterwards
+        self.b[2] = "2"
+        del self.b[15]
+        self.assertEqual(list(self.b), [1, 2, 3, 4, 5, 10, 17, 20, 22, 25, 30])
+
+    def test_from_sorted(self):
+        self.b = AVLTree.from_sorted([])
+        self.assertTrue(self.b.is_empty())
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([(1, "A"), (3, "B"), (2, "C")])
+        with self.assertRaises(ValueError):
+            AVLTree.from_items([(1, "A"), (1, "B")])
+
+    def check_sizes(self, current) -> int:
+        if current is None:
+            return 0
+        size = 1 + self.check_sizes(current.left) + self.check_sizes(current.right)
+        self.assertEqual(current.size, size)
+        return size
+
+    def test_order_statistics(self):
+        rand = random.Random(0)
+        for iterative in (True, False):
+            self.b = AVLTree()
+            self.b.iterative = iterative
+            keys = []
+            for step in range(2000):
+                if keys and rand.random() < 0.4:  # Deleting, which used to leave the counts wrong
+                    key = keys.pop(rand.randrange(len(keys)))
+                    del self.b[key]
+                else:
+                    key = rand.randrange(10 ** 6)
+                    if key not in keys:
+                        keys.append(key)
+                        self.b[key] = str(key)
+                if step % 100 == 0:
+                    self.assertEqual(self.check_sizes(self.b.root), len(keys))
+            self.assertEqual(self.check_sizes(self.b.root), len(keys))
+            keys.sort()
+            self.assertEqual([self.b.kth_smallest(k).key for k in range(1, len(keys) + 1)], keys)
+            self.assertEqual([self.b.kth_largest(k).key for k in range(1, len(keys) + 1)], keys[::-1])
+            self.assertEqual(self.b.kth_largest_aux(3, self.b.root).key, keys[-3])
+            for i, key in enumerate(keys):
+                self.assertEqual(self.b.rank(key), i)
+                self.assertEqual(self.b.rank(key + 0.5), i + 1)
+            lo, hi = keys[10], keys[50]
+            self.assertEqual(self.b.count_range(lo, hi), 40)
+            self.assertEqual(self.b.count_range(lo - 0.5, hi + 0.5), 41)
+            self.assertEqual(self.b.count_range(hi, lo), 0)
+            for k in (0, len(keys) + 1):
+                with self.assertRaises(IndexError):
+                    self.b.kth_smallest(k)
+                with self.assertRaises(IndexError):
+                    self.b.kth_largest(k)
+
+    def test_order_statistics_from_items(self):
+        self.b = AVLTree.from_items([(key, str(key)) for key in range(100)])
+        self.assertEqual(self.check_sizes(self.b.root), 100)
+        self.assertEqual(self.b.kth_smallest(42).key, 41)
+        self.assertEqual(self.b.count_range(10, 20), 10)
+        self.assertEqual(self.b.rank(-1), 0)
+        self.assertEqual(AVLTree().rank(5), 0)
+
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestAVL)
@@ -1,6 +1,9 @@
+import random
 import unittest
+from itertools import islice
 
-from bst import BinarySearchTree
+from avl import AVLTree
+from bst import BinarySearchTree, BSTInOrderIterator
 
 class TestBST(unittest.TestCase):
     
@@ -39,6 +42,51 @@ class TestBST(unittest.TestCase):
         self.assertEqual(self.b.get_successor(self.b.get_tree_node_by_key(15)).item, "D")
         self.assertEqual(self.b.get_successor(self.b.get_tree_node_by_key(5)), None)
 
+    def test_in_order(self):
+        self.assertEqual(list(self.b), [3, 4, 5, 10, 15, 17, 20, 22])
+        iterator = BSTInOrderIterator(self.b.root, True)
+        self.assertEqual(next(iterator), (3, "F"))
+        self.assertEqual(iterator.stack, [self.b.get_tree_node_by_key(15), self.b.get_tree_node_by_key(10),
+                                          self.b.get_tree_node_by_key(5)])
+        self.assertEqual([key for key, _ in iterator], [4, 5, 10, 15, 17, 20, 22])
+        self.assertEqual(list(BinarySearchTree()), [])
+
+    def test_items(self):
+        self.assertEqual(list(self.b.items()), [(3, "F"), (4, "G"), (5, "E"), (10, "B"), (15, "A"), (17, "D"),
+                                                (20, "C"), (22, "H")])
+        self.assertEqual(list(self.b.items(5, 20)), [(5, "E"), (10, "B"), (15, "A"), (17, "D")])
+        self.assertEqual(list(self.b.items(6, 21)), [(10, "B"), (15, "A"), (17, "D"), (20, "C")])
+        self.assertEqual(list(self.b.items(hi=5)), [(3, "F"), (4, "G")])
+        self.assertEqual(list(self.b.items(16, 16)), [])
+        self.assertEqual(list(self.b.items(30)), [])
+        self.assertEqual(list(BinarySearchTree().items()), [])
+
+    def test_reversed(self):
+        self.assertEqual([key for key, _ in self.b.reversed()], [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertEqual(list(self.b.reversed(5, 20)), [(17, "D"), (15, "A"), (10, "B"), (5, "E")])
+        self.assertEqual(list(self.b.reversed(hi=4)), [(3, "F")])
+
+    def test_iter_from(self):
+        self.assertEqual([key for key, _ in self.b.iter_from(15)], [15, 17, 20, 22])
+        self.assertEqual([key for key, _ in self.b.iter_from(11)], [15, 17, 20, 22])
+        iterator = self.b.iter_from(4)
+        self.assertEqual(next(iterator), (4, "G"))
+        # Only a path of the tree is kept, not every node still to come
+        self.assertLessEqual(len(iterator.stack), 4)
+        self.assertEqual(next(iterator), (5, "E"))
+
+    def test_items_large(self):
+        rand = random.Random(0)
+        keys = rand.sample(range(10 ** 6), 2000)
+        tree = AVLTree.from_items([(key, str(key)) for key in keys])
+        keys.sort()
+        for lo, hi in [(keys[100], keys[200]), (keys[0] - 1, keys[0]), (500000, 500001), (None, keys[10])]:
+            expected = [key for key in keys if (lo is None or lo <= key) and key < hi]
+            self.assertEqual([key for key, _ in tree.items(lo, hi)], expected)
+            self.assertEqual([key for key, _ in tree.reversed(lo, hi)], expected[::-1])
+        self.assertEqual([key for key, _ in islice(tree.reversed(), 50)], keys[:-51:-1])
+        self.assertEqual([item for _, item in islice(tree.iter_from(keys[7] + 1), 3)], [str(k) for k in keys[8:11]])
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestBST)
     unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,94 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from catalog_snapshot import HEADER, CatalogSnapshot, save_catalog_snapshot
+from game import Game
+from potion_catalog import PotionCatalog
+
+
+class TestCatalogSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "catalog.snap")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_catalog(self, good_hash=True):
+        catalog = PotionCatalog(50, good_hash)
+        catalog.add_many([(str(i), "Type " + str(i % 3), i + 0.5) for i in range(50)], [i * 2 for i in range(50)])
+        catalog.add_many([("Ünïcode", "Typé", 1.25)], [3])
+        return catalog
+
+    def test_round_trip(self):
+        for good_hash in (True, False):
+            catalog = self.make_catalog(good_hash)
+            save_catalog_snapshot(catalog, self.path)
+            with CatalogSnapshot(self.path) as snapshot:
+                self.assertEqual(len(snapshot), len(catalog))
+                self.assertEqual(snapshot.table_size, catalog.table_size)
+                self.assertEqual(snapshot.potion_types, catalog.potion_types)
+                for name, potion in catalog.items():
+                    loaded = snapshot[name]
+                    self.assertEqual((loaded.potion_type, loaded.name, loaded.buy_price, loaded.quantity),
+                                     (potion.potion_type, potion.name, potion.buy_price, potion.quantity))
+                    self.assertEqual(snapshot.id_of(name), catalog.id_of(name))
+                self.assertFalse("missing" in snapshot)
+                with self.assertRaises(KeyError):
+                    snapshot["missing"]
+                self.assertEqual(snapshot.ids_of(["7", "Ünïcode", "7"]), [7, 50, 7])
+                self.assertEqual(list(snapshot.buy_prices), list(catalog.buy_prices))
+                # Quantities can be changed, without changing the file
+                snapshot.quantities[7] += 1
+                self.assertEqual(snapshot["7"].quantity, 15)
+            with CatalogSnapshot(self.path) as snapshot:
+                self.assertEqual(snapshot["7"].quantity, 14)
+
+    def test_stale(self):
+        save_catalog_snapshot(self.make_catalog(), self.path)
+        with open(self.path, "rb") as snapshot_file:
+            data = bytearray(snapshot_file.read())
+
+        def rejected(changed: bytearray, verify: bool = True) -> None:
+            with open(self.path, "wb") as snapshot_file:
+                snapshot_file.write(changed)
+            with self.assertRaises(ValueError):
+                CatalogSnapshot(self.path, verify)
+
+        wrong_version = bytearray(data)
+        struct.pack_into("<I", wrong_version, 8, 1)
+        rejected(wrong_version)
+        wrong_hash = bytearray(data)
+        struct.pack_into("<I", wrong_hash, 16, 7)
+        rejected(wrong_hash)
+        corrupt = bytearray(data)
+        corrupt[-1] ^= 0xFF
+        rejected(corrupt)
+        rejected(data[:HEADER.size + 4], False)
+        rejected(b"not a snapshot" * 10, False)
+
+    def test_game(self):
+        g = Game()
+        g.set_total_potion_data([(str(x), "Type", x) for x in range(1, 101)])
+        g.save_potion_data(self.path)
+
+        loaded = Game()
+        loaded.load_potion_data(self.path)
+        for game in (g, loaded):
+            game.add_potions_to_inventory([(str(x), x) for x in range(1, 51)])
+            game.add_potions_to_inventory([(str(x), x) for x in range(51, 101)])
+            game.remove_potions_from_inventory(["5"])
+        self.assertEqual(loaded.catalog["10"].quantity, 10)
+        valuations = [(str(x), x * (1 + x % 4) / 2) for x in range(1, 101) if x != 5]
+        days = [0, 50, 500, 5000]
+        self.assertEqual(loaded.solve_game(valuations, days), g.solve_game(valuations, days))
+        loaded.catalog.close()
+
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestCatalogSnapshot)
+    unittest.TextTestRunner(verbosity=0).run(suite)
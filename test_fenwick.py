@@ -0,0 +1,29 @@
+import unittest
+
+from fenwick import FenwickTree
+
+
+class TestFenwick(unittest.TestCase):
+
+    def test_prefix_sum(self):
+        counts = [3, 0, 2, 5, 1, 4, 0]
+        f = FenwickTree(counts)
+        for i in range(len(counts) + 1):
+            self.assertEqual(f.prefix_sum(i), sum(counts[:i]))
+        f.add(3, -5)
+        self.assertEqual(f.prefix_sum(4), 5)
+        self.assertEqual(f.total, 10)
+
+    def test_select(self):
+        f = FenwickTree([1] * 10)
+        self.assertEqual([f.select(k) for k in range(1, 11)], list(range(10)))
+        f.add(0, -1)
+        f.add(4, -1)
+        self.assertEqual([f.select(k) for k in range(1, 9)], [1, 2, 3, 5, 6, 7, 8, 9])
+        with self.assertRaises(IndexError):
+            f.select(9)
+
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestFenwick)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -1,6 +1,9 @@
 import unittest
 
+import game
 from game import Game
+from random_gen import RandomGen
+from solver import NUMPY_AVAILABLE
 
 
 class TestGame(unittest.TestCase):
@@ -25,7 +28,42 @@ class TestGame(unittest.TestCase):
         # Vendor Selection gives unique results
         self.assertTrue(len(set(res)) == len(set(res2)) == 99)
 
-    def test_example(self):
+    def test_choose_vendors_order(self):
+        g = Game()
+        g.set_total_potion_data([(str(x), str(x), x) for x in range(1, 51)])
+        g.add_potions_to_inventory([(str(x), x) for x in range(1, 51)])
+        # Each vendor takes the randint(C)'th most expensive of the C potions left, checked against a sorted list.
+        # This is a deliberate change: the old AVL selection was wrong from the very first draw, where randint(50)
+        # is 27 and it gave '28' instead of the 27th most expensive, '24'.
+        rand_gen = RandomGen()
+        prices = list(range(1, 51))
+        expected = []
+        while prices:
+            price = prices.pop(len(prices) - rand_gen.randint(len(prices)))
+            expected.append((str(price), price))
+        result = g.choose_potions_for_vendors(50)
+        self.assertEqual(result, expected)
+        self.assertEqual(result[:8], [("24", 24), ("17", 17), ("40", 40), ("8", 8), ("45", 45), ("18", 18),
+                                      ("28", 28), ("10", 10)])
+        # A generator can be given, such as one advanced past the draws of an earlier shard
+        shard = RandomGen(3)
+        shard.advance(100)
+        rand_gen = RandomGen(3)
+        for _ in range(100):
+            rand_gen.randint(1)
+        prices = list(range(1, 51))
+        expected = []
+        while prices:
+            price = prices.pop(len(prices) - rand_gen.randint(len(prices)))
+            expected.append((str(price), 0))  # The first choice emptied the inventory
+        self.assertEqual(g.choose_potions_for_vendors(50, shard), expected)
+        self.assertEqual(shard.state, rand_gen.state)
+        # Afterwards the vendor inventory is emptied, without losing any potions
+        self.assertEqual(len(g.vendor_company_tree), 50)
+        self.assertEqual(g.vendor_company_tree[7], ("7", 0))
+        self.assertEqual(g.catalog.quantities[g.vendor_company_hash["7"]], 0)
+
+    def make_example_game(self):
         G = Game()
         # There are these potions, with these stats, available over the course of the game.
         G.set_total_potion_data([
@@ -47,7 +85,10 @@ class TestGame(unittest.TestCase):
             ("Potion of Increased Stamina", 10),
             ("Potion of Untenable Odour", 5),
         ])
+        return G
 
+    def test_example(self):
+        G = self.make_example_game()
         full_vendor_info = [
             ("Potion of Health Regeneration", 30),
             ("Potion of Extreme Speed", 15),
@@ -59,6 +100,99 @@ class TestGame(unittest.TestCase):
         results = G.solve_game(full_vendor_info, [12.5, 45, 80])
         self.assertEqual(results, [37.5, 90, 142.5])
 
+        # Every profitable potion is bought exactly once, however much money there is.
+        self.assertEqual(G.solve_game(full_vendor_info, [1000]), [240])
+        # Days given in sorted order give the same answers.
+        self.assertEqual(G.solve_game(full_vendor_info, [12.5, 45, 80, 1000], True), [37.5, 90, 142.5, 240])
+
+    def assert_almost_equal_lists(self, results, expected):
+        self.assertEqual(len(results), len(expected))
+        for got, want in zip(results, expected):
+            self.assertAlmostEqual(got, want)
+
+    @unittest.skipIf(not NUMPY_AVAILABLE, "NumPy is not installed")
+    def test_example_numpy(self):
+        G = self.make_example_game()
+        G.numpy_threshold = 0  # Always use the NumPy backend
+        full_vendor_info = [
+            ("Potion of Health Regeneration", 30),
+            ("Potion of Extreme Speed", 15),
+            ("Potion of Instant Health", 15),
+            ("Potion of Increased Stamina", 20),
+        ]
+        self.assert_almost_equal_lists(G.solve_game(full_vendor_info, [12.5, 45, 80, 1000, 0]),
+                                       [37.5, 90, 142.5, 240, 0])
+        self.assert_almost_equal_lists(G.solve_game(full_vendor_info[3:], [0, 50]), [0, 0])
+        # Sorted days are checked on the NumPy backend too
+        self.assert_almost_equal_lists(G.solve_game(full_vendor_info, [0, 12.5, 45, 80, 1000], True),
+                                       [0, 37.5, 90, 142.5, 240])
+        with self.assertRaises(ValueError):
+            G.solve_game(full_vendor_info, [45, 12.5], True)
+
+    def test_solve_game_iter(self):
+        G = self.make_example_game()
+        full_vendor_info = [
+            ("Potion of Health Regeneration", 30),
+            ("Potion of Extreme Speed", 15),
+            ("Potion of Instant Health", 15),
+            ("Potion of Increased Stamina", 20),
+        ]
+        days = [12.5, 45, 80, 1000, 0]
+        # Days come from a generator and are answered in chunks smaller than the number of days
+        results = G.solve_game_iter(full_vendor_info, (money for money in days), chunk_size=2)
+        self.assertEqual(list(results), [37.5, 90, 142.5, 240, 0])
+
+    def test_solve_many(self):
+        G = self.make_example_game()
+        scenarios = [
+            ([("Potion of Health Regeneration", 30), ("Potion of Instant Health", 15)], [12.5, 45, 80]),
+            ([("Potion of Extreme Speed", 15), ("Potion of Increased Stamina", 20)], [10, 100]),
+            ([("Potion of Increased Stamina", 50)], []),
+        ] * 5
+        expected = [G.solve_game(valuations, money) for valuations, money in scenarios]
+        # Serially, then across worker processes
+        self.assertEqual(G.solve_many(scenarios, workers=1), expected)
+        G.solve_many_serial_threshold = 0
+        self.assertEqual(G.solve_many(scenarios, workers=2, chunksize=2), expected)
+
+    def test_solve_many_worker_threshold(self):
+        # Workers use the numpy_threshold of the game solve_many is called on, not the class default
+        game._init_solve_worker([("Health", "Potion of Instant Health", 5, 3)], 1)
+        self.assertEqual(game._worker_game.numpy_threshold, 1)
+        self.assertEqual(game._solve_scenario(([("Potion of Instant Health", 10)], [15])), [30])
+
+    def test_inventory_updates(self):
+        G = self.make_example_game()
+        table = G.vendor_company_hash
+        G.remove_potions_from_inventory(["Potion of Instant Health"])
+        G.add_potions_to_inventory([("Potion of Deadly Poison", 2)])
+        # The vendor hash table is updated in place
+        self.assertIs(G.vendor_company_hash, table)
+        self.assertFalse("Potion of Instant Health" in G.vendor_company_hash)
+        self.assertEqual(G.catalog["Potion of Extreme Speed"].quantity, 5)
+        self.assertEqual(G.catalog["Potion of Deadly Poison"].quantity, 2)
+        self.assertEqual(G.catalog["Potion of Instant Health"].quantity, 0)
+        self.assertEqual(list(G.vendor_company_tree), [1, 10, 20, 25, 45])
+        with self.assertRaises(KeyError):
+            G.remove_potions_from_inventory(["Potion of Instant Health"])
+
+    def test_unprofitable(self):
+        G = Game()
+        G.set_total_potion_data([
+            ["Potion of Health Regeneration", "Health", 20],
+            ["Potion of Extreme Speed", "Buff", 10],
+        ])
+        G.add_potions_to_inventory([
+            ("Potion of Health Regeneration", 4),
+            ("Potion of Extreme Speed", 5),
+        ])
+        # No potion sells for more than it costs, so no money is made.
+        results = G.solve_game([
+            ("Potion of Health Regeneration", 20),
+            ("Potion of Extreme Speed", 5),
+        ], [0, 50])
+        self.assertEqual(results, [0, 0])
+
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestGame)
@@ -34,6 +34,279 @@ class TestTable(unittest.TestCase):
         
         self.assertEqual(l.statistics(), (3, 4, 2))
 
+    def test_grow(self):
+        t = LinearProbePotionTable(4, True, 5)
+        for i in range(100):
+            t[str(i)] = i
+        self.assertEqual(len(t), 100)
+        self.assertGreater(t.resize_count, 0)
+        self.assertLessEqual(len(t) / len(t.table), t.max_load_factor)
+        for i in range(100):
+            self.assertEqual(t[str(i)], i)
+        # Resizing by hand keeps every item too
+        t.initalise_with_tablesize(1009)
+        self.assertEqual(len(t.table), 1009)
+        self.assertEqual([t[str(i)] for i in range(100)], list(range(100)))
+        with self.assertRaises(ValueError):
+            t.initalise_with_tablesize(50)
+
+    def test_update_at_threshold(self):
+        t = LinearProbePotionTable(4, True, 8)
+        for i in range(6):  # Exactly at the maximum load factor of 0.75
+            t[str(i)] = i
+        t["3"] = "updated"
+        self.assertEqual((t.resize_count, len(t.table), t["3"]), (0, 8, "updated"))
+        t["6"] = 6  # A new key still makes the table grow
+        self.assertEqual(t.resize_count, 1)
+        self.assertEqual([t[str(i)] for i in range(7)], [0, 1, 2, "updated", 4, 5, 6])
+        for max_load_factor in (0, -0.5, 1.5):
+            with self.assertRaises(ValueError):
+                LinearProbePotionTable(4, True, 8, max_load_factor)
+        LinearProbePotionTable(4, True, 8, 1)
+
+    def test_fixed_size(self):
+        t = LinearProbePotionTable(3, True, 3, None)
+        for i in range(3):
+            t[str(i)] = i
+        t["0"] = "updated"
+        self.assertEqual(t["0"], "updated")
+        with self.assertRaises(ValueError):
+            t["3"] = 3
+
+    def test_delete(self):
+        t = LinearProbePotionTable(20, True, 40, None)
+        for i in range(20):
+            t[str(i)] = i
+        for i in range(0, 20, 2):
+            del t[str(i)]
+        self.assertEqual(len(t), 10)
+        for i in range(20):
+            self.assertEqual(str(i) in t, i % 2 == 1)
+        with self.assertRaises(KeyError):
+            del t["0"]
+        # Deleted slots are reused, and too many tombstones are cleared by rehashing
+        for i in range(0, 20, 2):
+            t[str(i)] = -i
+        self.assertEqual(len(t), 20)
+        self.assertEqual(t["4"], -4)
+        for i in range(20):
+            del t[str(i)]
+        self.assertTrue(t.is_empty())
+        self.assertLessEqual(t.tombstones * 4, len(t.table))
+        self.assertEqual(t.items(), [])
+
+    def test_delete_collisions(self):
+        lookup = {"s1": 5, "s2": 5, "s3": 5, "s4": 7}
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            l = LinearProbePotionTable(10, True, 10)
+            for key in lookup:
+                l[key] = key
+            # s2 sits between s1 and s3 in the same cluster, so s3 must still be found after it goes
+            del l["s2"]
+            self.assertEqual(l["s3"], "s3")
+            self.assertEqual(l["s4"], "s4")
+            self.assertFalse("s2" in l)
+            l["s2"] = "again"
+            self.assertEqual(l.tombstones, 0)
+            self.assertEqual(l["s2"], "again")
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_robin_hood(self):
+        lookup = {"s1": 5, "s2": 5, "s3": 6, "s4": 6, "s5": 5}
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            l = LinearProbePotionTable(10, True, 10, None, True)
+            for key in lookup:
+                l[key] = key
+            # s5 is further from home than s3, so it takes the place of s3, which moves on past s4
+            self.assertEqual([l.table[p][0] for p in range(5, 10)], ["s1", "s2", "s5", "s4", "s3"])
+            self.assertEqual(l.statistics(True)[3], [1, 1, 2, 1])
+            for key in lookup:
+                self.assertEqual(l[key], key)
+            # Deleting shifts the rest of the cluster back
+            del l["s2"]
+            self.assertEqual([l.table[p][0] for p in range(5, 9)], ["s1", "s5", "s4", "s3"])
+            self.assertIsNone(l.table[9])
+            self.assertEqual(l.statistics(True)[3], [1, 2, 1])
+            l["s4"] = "updated"
+            self.assertEqual(l["s4"], "updated")
+            self.assertEqual(len(l), 4)
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_robin_hood_grow(self):
+        t = LinearProbePotionTable(4, True, 5, 0.75, True)
+        for i in range(200):
+            t[str(i)] = i
+        for i in range(0, 200, 3):
+            del t[str(i)]
+        for i in range(200):
+            self.assertEqual(str(i) in t, i % 3 != 0)
+        self.assertEqual(sum(t.probe_distribution()), len(t))
+
+    def test_instrumentation(self):
+        lookup = {"s1": 5, "s2": 5, "s3": 5, "s4": 7, "s5": 5}
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            l = LinearProbePotionTable(10, True, 10)
+            with self.assertRaises(ValueError):
+                l.instrumentation_snapshot()
+            l.enable_instrumentation(2)
+            for key in ["s1", "s2", "s3", "s4"]:
+                l[key] = key
+            l["s1"] = "again"
+            self.assertEqual(l["s3"], "s3")
+            self.assertFalse("s5" in l)
+
+            snapshot = l.instrumentation_snapshot(reset=True)
+            self.assertEqual(snapshot["inserts"], 4)
+            self.assertEqual(snapshot["updates"], 1)
+            self.assertEqual(snapshot["hits"], 1)
+            self.assertEqual(snapshot["misses"], 1)
+            # Probes: s1 0, s2 1, s3 2, s4 1, s1 0, s3 2, s5 4
+            self.assertEqual(snapshot["histogram"], [2, 2, 2, 0, 1])
+            self.assertEqual(snapshot["worst_offenders"], [("s5", 4), ("s3", 2)])
+
+            # Reset left everything at zero, and the table itself is unchanged
+            snapshot = l.instrumentation_snapshot()
+            self.assertEqual((snapshot["hits"], snapshot["histogram"], snapshot["worst_offenders"]), (0, [], []))
+            self.assertEqual(l.statistics(), (5, 10, 4))
+            l.disable_instrumentation()
+            self.assertEqual(l["s4"], "s4")
+            self.assertIsNone(l.instrumentation)
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_compact(self):
+        with self.assertRaises(ValueError):
+            LinearProbePotionTable(10, True, -1, 0.75, True, True)
+        t = LinearProbePotionTable(4, True, 5, 0.75, False, True)
+        plain = LinearProbePotionTable(4, True, 5)
+        for i in range(300):
+            t[str(i)] = i
+            plain[str(i)] = i
+        t["7"] = "updated"
+        plain["7"] = "updated"
+        for i in range(0, 300, 3):
+            del t[str(i)]
+            del plain[str(i)]
+        # Same slots and statistics as the tuple storage, with no tuples stored
+        self.assertEqual(t.items(), plain.items())
+        self.assertEqual(t.statistics(True), plain.statistics(True))
+        self.assertEqual(t.resize_count, plain.resize_count)
+        self.assertEqual(len(t), 200)
+        self.assertEqual(t["7"], "updated")
+        for i in range(300):
+            self.assertEqual(str(i) in t, i % 3 != 0)
+        with self.assertRaises(KeyError):
+            del t["0"]
+
+    def test_compact_collisions(self):
+        lookup = {"s1": 5, "s2": 5, "s3": 5, "s4": 7}
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            l = LinearProbePotionTable(10, True, 10, None, False, True)
+            for key in lookup:
+                l[key] = key
+            self.assertEqual(list(l.homes[5:9]), [5, 5, 5, 7])
+            del l["s2"]
+            self.assertEqual(l.homes[6], -1)
+            self.assertEqual(l["s3"], "s3")
+            self.assertFalse("s2" in l)
+            l["s2"] = "again"
+            self.assertEqual(l.tombstones, 0)
+            self.assertEqual((l.table[6], l.values[6]), ("s2", "again"))
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_batch(self):
+        for robin_hood, compact in ((False, False), (True, False), (False, True)):
+            t = LinearProbePotionTable(4, True, 5, 0.75, robin_hood, compact)
+            one_at_a_time = LinearProbePotionTable(4, True, 5, 0.75, robin_hood, compact)
+            pairs = [(str(i), i) for i in range(100)] + [("7", "updated")]
+            t.set_many(pairs)
+            for key, data in pairs:
+                one_at_a_time[key] = data
+            self.assertEqual(t.items(), one_at_a_time.items())
+            self.assertEqual(t.resize_count, 1)  # Grown once for the whole batch
+            self.assertEqual(t.get_many(["3", "7", "3", "99"]), [3, "updated", 3, 99])
+            with self.assertRaises(KeyError):
+                t.get_many(["1", "missing"])
+
+            self.assertEqual(t.update_many(["1", "2", "1"], lambda x: x * 10), [10, 20, 100])
+            self.assertEqual(t.get_many(["1", "2"]), [100, 20])
+            with self.assertRaises(KeyError):
+                t.update_many(["3", "missing"], lambda x: x + 1)
+            self.assertEqual(t["3"], 3)
+            t.set_many([("1", 1), ("new", "new")])
+            self.assertEqual((t["1"], t["new"], len(t)), (1, "new", 101))
+
+    def test_batch_overridden_hash(self):
+        class FirstLetterTable(LinearProbePotionTable):
+            def hash(self, potion_name: str) -> int:
+                return ord(potion_name[0]) % self.table_size
+
+        t = FirstLetterTable(10, True, 11, None)
+        t.set_many([("apple", 1), ("avocado", 2), ("banana", 3)])
+        self.assertEqual((t["apple"], t["avocado"], t["banana"]), (1, 2, 3))
+        t["cherry"] = 4
+        self.assertEqual(t.get_many(["cherry", "avocado"]), [4, 2])
+        self.assertEqual(t.update_many(["banana"], lambda x: x * 10), [30])
+        self.assertEqual(t.hash_many(["apple", "cherry"]), [t.hash("apple"), t.hash("cherry")])
+
+        # Replacing hash on the class itself is picked up as well
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = lambda self, k: 3
+        try:
+            t = LinearProbePotionTable(10, True, 11)
+            t["x"] = 1
+            self.assertEqual(t.get_many(["x"]), [1])
+            self.assertEqual(t.hash_many(["x", "y"]), [3, 3])
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_batch_fixed_size(self):
+        t = LinearProbePotionTable(3, True, 3, None)
+        t.set_many([("0", 0), ("1", 1)])
+        with self.assertRaises(ValueError):
+            t.set_many([("0", "updated"), ("2", 2), ("3", 3)])
+        self.assertEqual(sorted(t.items()), [("0", 0), ("1", 1)])  # Nothing was set
+        t.set_many([("0", "updated"), ("2", 2), ("2", "again")])
+        self.assertEqual(t.get_many(["0", "1", "2"]), ["updated", 1, "again"])
+
+    def test_instrumentation_full_table(self):
+        t = LinearProbePotionTable(3, True, 3, None)
+        for i in range(3):
+            t[str(i)] = i
+        t.enable_instrumentation()
+        t["0"] = "updated"
+        with self.assertRaises(ValueError):
+            t["3"] = 3
+        snapshot = t.instrumentation_snapshot()
+        # Only the update is recorded, not a lookup to check for the key
+        self.assertEqual((snapshot["updates"], snapshot["hits"], snapshot["misses"]), (1, 0, 0))
+
+    def test_batch_instrumentation(self):
+        t = LinearProbePotionTable(10)
+        t.enable_instrumentation()
+        t.set_many([("a", 1), ("b", 2), ("a", 3)])
+        t.get_many(["a", "a", "b"])
+        t.update_many(["b"], lambda x: x + 1)
+        snapshot = t.instrumentation_snapshot()
+        self.assertEqual((snapshot["inserts"], snapshot["updates"], snapshot["hits"]), (2, 1, 3))
+        self.assertEqual(t.get_many(["a", "b"]), [3, 3])
+
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestTable)
     unittest.TextTestRunner(verbosity=0).run(suite)
@@ -1,5 +1,6 @@
 import unittest
 
+from hash_table import LinearProbePotionTable
 from potion import Potion
 
 class TestPotion(unittest.TestCase):
@@ -16,6 +17,32 @@ class TestPotion(unittest.TestCase):
         self.assertEqual(p2.buy_price, 20)
         self.assertEqual(p2.quantity, 0)
 
+    def test_slots(self):
+        # Potions keep their attributes in __slots__, without a __dict__ per potion
+        p = Potion("Buff", "Potion of Extreme Speed", 40, 4)
+        self.assertFalse(hasattr(p, '__dict__'))
+        self.assertFalse(hasattr(Potion.create_empty("Health", "Potion of Regeneration", 20), '__dict__'))
+
+    def test_good_hash(self):
+        names = ["Potion of Extreme Speed", "Potion of Health Regeneration", "abc", ""]
+        self.assertEqual(Potion.good_hash(names[0], 101), 86)
+        self.assertEqual(Potion.good_hash(names[1], 12), 2)
+        self.assertEqual(Potion.good_hash(names[2], 7919), 2301)
+        for tablesize in (12, 101, 7919):
+            self.assertEqual(Potion.hash_many(names, tablesize), [Potion.good_hash(n, tablesize) for n in names])
+
+    def test_bad_hash(self):
+        # The sum of the characters is 854, which is past the end of a table of 101
+        self.assertEqual(Potion.bad_hash("Potion of Extreme Speed", 101), 854 % 101)
+        names = ["Potion of Extreme Speed", "Potion of Health Regeneration", "abc", ""]
+        for tablesize in (7, 20, 101):
+            for name in names:
+                self.assertIn(Potion.bad_hash(name, tablesize), range(tablesize))
+        t = LinearProbePotionTable(10, False)
+        for name in names:
+            t[name] = name
+        self.assertEqual([t[name] for name in names], names)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPotion)
     unittest.TextTestRunner(verbosity=0).run(suite)
@@ -0,0 +1,44 @@
+import unittest
+from array import array
+
+from potion_catalog import PotionCatalog
+
+
+class TestPotionCatalog(unittest.TestCase):
+
+    def test_columns(self):
+        catalog = PotionCatalog.from_potion_data([
+            ["Potion of Health Regeneration", "Health", 20],
+            ["Potion of Extreme Speed", "Buff", 10],
+            ["Potion of Instant Health", "Health", 5],
+        ])
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual(catalog.ids_of(["Potion of Instant Health", "Potion of Extreme Speed"]), [2, 1])
+        self.assertEqual(catalog.potion_types, ["Health", "Buff"])
+        self.assertEqual(catalog.type_ids, array('i', [0, 1, 0]))
+        self.assertEqual(catalog.buy_prices, array('d', [20, 10, 5]))
+        self.assertEqual(catalog.quantities, array('d', [0, 0, 0]))
+
+        potion = catalog["Potion of Extreme Speed"]
+        self.assertEqual((potion.potion_type, potion.name, potion.buy_price, potion.quantity),
+                         ("Buff", "Potion of Extreme Speed", 10, 0))
+        potion.quantity = 5  # A copy, the catalog is not changed
+        self.assertEqual(catalog.quantities[1], 0)
+        self.assertFalse("Potion of Deadly Poison" in catalog)
+        with self.assertRaises(KeyError):
+            catalog.id_of("Potion of Deadly Poison")
+
+    def test_add_many(self):
+        catalog = PotionCatalog()
+        self.assertEqual(catalog.add_many([("a", "x", 1), ("b", "y", 2), ("a", "z", 3)], [1, 2, 3]), [0, 1, 0])
+        # An existing name keeps its id, and the last details given for it are kept
+        self.assertEqual(catalog.add_many([("c", "x", 4), ("b", "x", 5)]), [2, 1])
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual([(name, potion.potion_type, potion.buy_price, potion.quantity)
+                          for name, potion in catalog.items()],
+                         [("a", "z", 3, 3), ("b", "x", 5, 0), ("c", "x", 4, 0)])
+
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestPotionCatalog)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -1,6 +1,14 @@
 import unittest
 
-from primes import largest_prime
+from primes import PrimeTable, largest_prime, next_prime, segmented_sieve, sieve
+
+
+def is_prime(n: int) -> bool:
+    d = 2
+    while d * d <= n and n % d != 0:
+        d += 1
+    return n >= 2 and d * d > n
+
 
 class TestPrimes(unittest.TestCase):
     
@@ -10,6 +18,43 @@ class TestPrimes(unittest.TestCase):
         for i, o in zip(inputs, outputs):
             self.assertEqual(largest_prime(i), o)
 
+    def test_next_prime(self):
+        inputs = [0, 2, 20, 43, 100000]
+        outputs = [2, 2, 23, 43, 100003]
+        for i, o in zip(inputs, outputs):
+            self.assertEqual(next_prime(i), o)
+
+    def test_sieve(self):
+        flags = sieve(5000)
+        self.assertEqual([n for n in range(5000) if flags[n]], [n for n in range(5000) if is_prime(n)])
+        self.assertEqual(sieve(0), bytearray())
+        self.assertEqual(sieve(2), bytearray(2))
+        for low, high in [(0, 100), (99990, 100100), (10 ** 6, 10 ** 6 + 1000), (5, 5), (1, 3)]:
+            self.assertEqual(segmented_sieve(low, high), [n for n in range(low, high) if is_prime(n)])
+
+    def test_large_values(self):
+        # The assertion that k < 100000 is gone, and a tiny table has to be extended to answer
+        table = PrimeTable(16)
+        for k in [3, 20, 100000, 10 ** 6 + 1, 2 * 10 ** 6, 123456789]:
+            found = table.largest_prime(k)
+            self.assertTrue(is_prime(found))
+            self.assertFalse(any(is_prime(n) for n in range(found + 1, k)))
+            found = table.next_prime(k)
+            self.assertTrue(is_prime(found))
+            self.assertFalse(any(is_prime(n) for n in range(k, found)))
+        self.assertEqual(next_prime(2 * 10 ** 6), 2000003)
+        self.assertEqual(largest_prime(10 ** 7), 9999991)
+        # Only the table needed for the square roots was sieved
+        self.assertLess(table.limit, 10 ** 5)
+        for k in [-5, 0, 1, 2]:
+            with self.assertRaises(ValueError):
+                largest_prime(k)
+        # Tables that start out too small to hold any prime still extend
+        for limit in (-1, 0, 1, 2):
+            self.assertEqual(PrimeTable(limit).next_prime(20), 23)
+            self.assertEqual(PrimeTable(limit).largest_prime(20), 19)
+            self.assertEqual(PrimeTable(limit).next_prime(0), 2)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPrimes)
     unittest.TextTestRunner(verbosity=0).run(suite)
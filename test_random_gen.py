@@ -1,6 +1,6 @@
 import unittest
 
-from random_gen import RandomGen
+from random_gen import RandomGen, check_nums, lcg
 
 
 class TestRandom(unittest.TestCase):
@@ -12,6 +12,73 @@ class TestRandom(unittest.TestCase):
         r = RandomGen(seed=25)
         self.assertEqual(r.randint(100), 69)
 
+    def string_randints(self, seed: int, k: int, n: int) -> list:
+        # randint as it used to be, building each number bit by bit from binary strings
+        numbers = lcg(pow(2, 32), 134775813, 1, seed)
+        result = []
+        for _ in range(n):
+            five_ran_nums = ["{:032b}".format(next(numbers))[:16] for _ in range(5)]
+            output_binary = "".join("1" if check_nums(five_ran_nums, i) else "0" for i in range(16))
+            result.append(int(output_binary, 2) % k + 1)
+        return result
+
+    def test_bit_for_bit(self):
+        for seed in (0, 25, 123456789, 2 ** 40 + 3):
+            r = RandomGen(seed)
+            self.assertEqual([r.randint(1000) for _ in range(500)], self.string_randints(seed, 1000, 500))
+            # The iterator and randint share the same lcg, so the iterator carries on after the fifth number
+            r = RandomGen(seed)
+            r.randint(10)
+            numbers = lcg(pow(2, 32), 134775813, 1, seed)
+            self.assertEqual(next(r.rand_numb_iter), [next(numbers) for _ in range(6)][5])
+
+    def test_randints(self):
+        for threshold in (10 ** 9, 0):  # Pure Python, then NumPy when it is installed
+            r = RandomGen(7)
+            r.numpy_threshold = threshold
+            numbers = r.randints(100, 300) + r.randints(3, 5) + [r.randint(50)]
+            self.assertEqual(numbers, self.string_randints(7, 100, 300) + self.string_randints(7, 3, 305)[300:] +
+                             self.string_randints(7, 50, 306)[305:])
+        r = RandomGen()
+        r.numpy_threshold = 0
+        self.assertEqual(r.randints(10, 0), [])
+
+    def test_randints_bad_k(self):
+        r = RandomGen(7)
+        r.numpy_threshold = 4
+        with self.assertRaises(ZeroDivisionError):
+            r.randints(0, r.numpy_threshold)
+        self.assertEqual(r.state, RandomGen(7).state)  # Nothing was drawn
+        expected = RandomGen(7)
+        self.assertEqual(r.randints(-5, 8), [expected.randint(-5) for _ in range(8)])
+
+    def test_advance(self):
+        r = RandomGen(11)
+        numbers = [r.randint(100) for _ in range(1000)]
+        r = RandomGen(11)
+        r.advance(0)
+        r.advance(600)
+        self.assertEqual([r.randint(100) for _ in range(400)], numbers[600:])
+
+    def test_split(self):
+        r = RandomGen(11)
+        numbers = [r.randint(100) for _ in range(1000)]
+        for k in (1, 3, 8):
+            for threshold in (10 ** 9, 0):
+                streams = RandomGen(11).split(k)
+                for stream in streams:
+                    stream.numpy_threshold = threshold
+                # Each stream gives every k'th number, starting from its own
+                for i, stream in enumerate(streams):
+                    self.assertEqual(stream.randints(100, len(numbers[i::k])), numbers[i::k])
+        # Streams can be split again, and advanced
+        streams = RandomGen(11).split(2)[1].split(3)
+        self.assertEqual([stream.randint(100) for stream in streams], [numbers[1], numbers[3], numbers[5]])
+        streams[0].advance(10)
+        self.assertEqual(streams[0].randint(100), numbers[1 + 6 * 11])
+        with self.assertRaises(ValueError):
+            RandomGen().split(0)
+
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestRandom)
@@ -0,0 +1,156 @@
+import unittest
+
+from game import Game
+from solver import IncrementalProfitSolver, ProfitSolver, solve_in_chunks
+
+
+def naive_solve(sorted_list_of_potions, starting_money):
+    # The day loop solve_game used before ProfitSolver, kept here to check against.
+    profit_output = []
+    for money_for_day in starting_money:
+        profit_for_day = 0
+        for amount, factor, _ in sorted_list_of_potions:
+            if money_for_day == 0:
+                break
+            if amount > money_for_day:
+                profit_for_day += money_for_day * factor
+                break
+            profit_for_day += amount * factor
+            money_for_day -= amount
+        profit_output.append(profit_for_day)
+    return profit_output
+
+
+class TestSolver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.potions = [
+            [15, 3.0, "Potion of Instant Health"],
+            [80, 1.5, "Potion of Health Regeneration"],
+            [50, 1.5, "Potion of Extreme Speed"],
+        ]
+        return super().setUp()
+
+    def test_example(self):
+        s = ProfitSolver(self.potions)
+        self.assertEqual(s.solve([12.5, 45, 80]), [37.5, 90, 142.5])
+        self.assertEqual(s.solve_sorted([12.5, 45, 80]), [37.5, 90, 142.5])
+
+    def test_matches_naive(self):
+        days = [0, 1, 14, 15, 16, 95, 144, 145, 146, 1000]
+        s = ProfitSolver(self.potions)
+        self.assertEqual(s.solve(days), naive_solve(self.potions, days))
+        self.assertEqual(s.solve_sorted(days), naive_solve(self.potions, days))
+
+    def test_empty(self):
+        s = ProfitSolver([])
+        self.assertEqual(s.solve([0, 10]), [0, 0])
+        self.assertEqual(s.solve_sorted([0, 10]), [0, 0])
+
+    def test_solve_in_chunks(self):
+        s = ProfitSolver(self.potions)
+        days = list(range(0, 300, 7))
+        for chunk_size in (1, 4, 100):
+            self.assertEqual(list(solve_in_chunks(s, iter(days), chunk_size)), s.solve(days))
+        self.assertEqual(list(solve_in_chunks(s, iter([]))), [])
+        with self.assertRaises(ValueError):  # Raised by the call itself, not when the first day is read
+            solve_in_chunks(s, days, 0)
+
+    def test_unsorted_days(self):
+        s = ProfitSolver(self.potions)
+        with self.assertRaises(ValueError):
+            s.solve_sorted([45, 12.5])
+
+
+class TestIncrementalSolver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.g = Game()
+        self.g.set_total_potion_data([
+            ["Potion of Health Regeneration", "Health", 20],
+            ["Potion of Extreme Speed", "Buff", 10],
+            ["Potion of Deadly Poison", "Damage", 45],
+            ["Potion of Instant Health", "Health", 5],
+            ["Potion of Increased Stamina", "Buff", 25],
+            ["Potion of Untenable Odour", "Damage", 1],
+        ])
+        self.g.add_potions_to_inventory([
+            ("Potion of Health Regeneration", 4),
+            ("Potion of Extreme Speed", 5),
+            ("Potion of Instant Health", 3),
+            ("Potion of Increased Stamina", 10),
+            ("Potion of Untenable Odour", 5),
+        ])
+        self.valuations = [
+            ("Potion of Health Regeneration", 30),
+            ("Potion of Extreme Speed", 15),
+            ("Potion of Instant Health", 15),
+            ("Potion of Increased Stamina", 20),
+        ]
+        return super().setUp()
+
+    def assert_matches_game(self, solver, valuations, days):
+        results, expected_results = solver.solve(days), self.g.solve_game(valuations, days)
+        self.assertEqual(len(results), len(expected_results))
+        for got, expected in zip(results, expected_results):
+            self.assertAlmostEqual(got, expected)
+
+    def test_example(self):
+        s = IncrementalProfitSolver(self.g, self.valuations)
+        self.assertEqual(len(s), 3)
+        self.assertEqual(s.solve([12.5, 45, 80, 1000]), [37.5, 90, 142.5, 240])
+
+    def test_updates(self):
+        days = [0, 10, 12.5, 45, 80, 150, 1000]
+        s = IncrementalProfitSolver(self.g, self.valuations)
+
+        # Stamina becomes the most profitable potion
+        s.set_valuation("Potion of Increased Stamina", 100)
+        valuations = self.valuations[:3] + [("Potion of Increased Stamina", 100)]
+        self.assertEqual(len(s), 4)
+        self.assert_matches_game(s, valuations, days)
+
+        # Regeneration stops being profitable
+        s.set_valuation("Potion of Health Regeneration", 10)
+        valuations[0] = ("Potion of Health Regeneration", 10)
+        self.assertEqual(len(s), 3)
+        self.assert_matches_game(s, valuations, days)
+
+        # Odour is added, then Speed is removed
+        s.set_valuation("Potion of Untenable Odour", 2)
+        valuations.append(("Potion of Untenable Odour", 2))
+        self.assert_matches_game(s, valuations, days)
+        s.remove_valuation("Potion of Extreme Speed")
+        valuations.pop(1)
+        self.assert_matches_game(s, valuations, days)
+
+        # Removing a potion that is not ranked does nothing
+        s.remove_valuation("Potion of Extreme Speed")
+        self.assertEqual(len(s), 3)
+
+        # A failed update leaves the ranking as it was
+        self.g.remove_potions_from_inventory(["Potion of Increased Stamina"])
+        with self.assertRaises(KeyError):
+            s.set_valuation("Potion of Increased Stamina", 200)
+        self.assertEqual(len(s), 3)
+        self.assertIn("Potion of Increased Stamina", s.tree_keys)
+
+    def test_many_updates(self):
+        g = Game()
+        g.set_total_potion_data([(str(x), "Buff", x) for x in range(1, 201)])
+        g.add_potions_to_inventory([(str(x), x % 7 + 1) for x in range(1, 201)])
+        valuations = {str(x): x * 1.5 for x in range(1, 201)}
+        s = IncrementalProfitSolver(g, list(valuations.items()))
+        for x in range(1, 201, 3):
+            valuations[str(x)] = (x * 37) % 250 + 1
+            s.set_valuation(str(x), valuations[str(x)])
+        days = [0, 1, 50, 333, 1000, 5000, 10 ** 6]
+        results, expected_results = s.solve(days), g.solve_game(list(valuations.items()), days)
+        self.assertEqual(len(results), len(expected_results))
+        for got, expected in zip(results, expected_results):
+            self.assertAlmostEqual(got, expected)
+
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestSolver)
+    unittest.TextTestRunner(verbosity=0).run(suite)